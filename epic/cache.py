@@ -0,0 +1,66 @@
+import time
+import threading
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from django.db import transaction
+
+# returned by TTLCache.get when nothing (or only an expired entry) is cached
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe least recently used cache with a bounded size whose entries expire after ``ttl`` seconds.
+    ``None`` is a legitimate value, use ``MISSING`` to tell a miss from a cached ``None``.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize, self.ttl = maxsize, ttl
+        self.hits = self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def set_on_commit(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Drop ``key`` right away but only cache ``value`` once the current transaction commits
+        (immediately outside of one) so rolled back writes never make it into the cache.
+        """
+        self.invalidate(key)
+        transaction.on_commit(lambda: self.set(key, value, ttl))
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"<TTLCache size={len(self)}/{self.maxsize} hits={self.hits} misses={self.misses}>"
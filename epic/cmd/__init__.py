@@ -8,10 +8,7 @@ from epic.utils import tokenize
 from epic.types.classes import ErrorMessage
 
 
-@execution_pipeline(pre=cmd.register.registry)
-def handle_rcd_command(
-    client, tokens, message, server, profile, msg, help=None, error=None, coro=None
-) -> HandlerResult:
+def _command_result(message, msg, error=None, coro=None) -> HandlerResult:
     _msg, _coro = msg, (None, ())
     if (error and not isinstance(error, str)) or not msg:
         original_tokens = tokenize(message.content[:250], preserve_case=True)
@@ -21,3 +18,32 @@ def handle_rcd_command(
     if coro and inspect.iscoroutinefunction(coro[0]):
         _coro = coro
     return [_msg], _coro
+
+
+@execution_pipeline(pre=cmd.register.registry)
+def handle_rcd_command(
+    client, tokens, message, server, profile, msg, help=None, error=None, coro=None
+) -> HandlerResult:
+    return _command_result(message, msg, error, coro)
+
+
+def dispatch_rcd_command(
+    client, tokens, message, server, profile, msg, help=None, error=None, coro=None
+) -> HandlerResult:
+    """
+    Equivalent to handle_rcd_command, but only runs the commands which can accept the given tokens.
+    """
+    params = cmd.register.dispatch(
+        {
+            "client": client,
+            "tokens": tokens,
+            "message": message,
+            "server": server,
+            "profile": profile,
+            "msg": msg,
+            "help": help,
+            "error": error,
+            "coro": coro,
+        }
+    )
+    return _command_result(params["message"], params["msg"], params["error"], params["coro"])
@@ -45,6 +45,7 @@ def _help(client, tokens, message, server, profile, msg, help=None):
         • `dibbs`, `d`: Claim dibbs on the next guild raid
         • `stats`, `s`: View stats about your gameplay that EPIC Helper Bot has collected
         • `logs`: Calculate the future log-value of your inventory
+        • `craftable`, `cr`: See how many of each recipe your inventory could craft
         • `checklist`, `c`: View the checklist for a particular area
         • `info`, `i`: Information on various topics relating to the bot
     """
@@ -132,7 +133,7 @@ def cd(client, tokens, message, server, profile, msg, help=None):
             "All commands on cooldown! (You may need to use `rpg cd` to populate your cooldowns for the first time.)\n"
         )
     event_info = ""
-    active_events = Event.objects.active().values_list("event_name", flat=True)
+    _, active_events = CoolDown.get_event_cooldown_map()
     if active_events:
         event_info = ", ".join(active_events) + " event(s) currently active.\n"
     return NormalMessage(
@@ -169,7 +170,7 @@ def info(client, tokens, message, server, profile, msg, help=None):
     topic = " ".join(tokens[1:])
     if topic in {"bot", "0"}:
         return {
-            "msg": NormalMessage(
+            "msg": NormalMessage.frozen(
                 """
             # Cooldown Calculations
             Cooldowns are determined in various ways which depend on how EPIC Rpg responds to your commands.
@@ -747,6 +748,31 @@ def dibbs(client, tokens, message, server, profile, msg, help=None):
         return {"msg": NormalMessage(f"Sorry, **{player_with_dibbs}** already has dibbs.", title="Not this time!")}
 
 
+def _inventory_sentinel(action, client, tokens, message, server, profile):
+    """
+    Leave a sentinel for the next time the (possibly mentioned) player opens their inventory.
+    Returns the sentinel's metadata, or None if the area was not valid.
+    """
+    full_message, metadata = " ".join(tokens), {"area": 5}
+    area_indicator = re.search(r" ([aA])?(\d{1,2})", full_message)
+    if area_indicator:
+        area = int(area_indicator.groups()[1])
+        start, end = area_indicator.span()
+        tokens, metadata["area"] = tokenize(f"{full_message[0:start]}{full_message[end:]}"), area
+    if not 1 <= metadata["area"] <= 15:
+        return None
+
+    mentioned_profile = Profile.from_tag(tokens[-1], client, server, message)
+    if mentioned_profile:
+        profile, metadata["snoop"] = mentioned_profile, profile.uid
+
+    open_sentinels = list(Sentinel.objects.filter(trigger=0, profile=profile, action=action))
+    len(open_sentinels) == 0 and Sentinel.objects.create(trigger=0, profile=profile, action=action, metadata=metadata)
+    for sentinel in open_sentinels:
+        sentinel.metadata.get("snoop", -1) == metadata.get("snoop", -1) and sentinel.update(metadata=metadata)
+    return metadata
+
+
 @register({"logs", "log"})
 def logs(client, tokens, message, server, profile, msg, help=None):
     """
@@ -771,24 +797,10 @@ def logs(client, tokens, message, server, profile, msg, help=None):
     if help or not tokens:
         return {"msg": HelpMessage(logs.__doc__)}
 
-    full_message, metadata = " ".join(tokens), {"area": 5}
-    area_indicator = re.search(r" ([aA])?(\d{1,2})", full_message)
-    if area_indicator:
-        area = int(area_indicator.groups()[1])
-        start, end = area_indicator.span()
-        tokens, metadata["area"] = tokenize(f"{full_message[0:start]}{full_message[end:]}"), area
-    if not 1 <= metadata["area"] <= 15:
+    metadata = _inventory_sentinel("logs", client, tokens, message, server, profile)
+    if metadata is None:
         return {"msg": ErrorMessage("Only areas 1-15 are valid!", title="Logs Error")}
 
-    mentioned_profile = Profile.from_tag(tokens[-1], client, server, message)
-    if mentioned_profile:
-        profile, metadata["snoop"] = mentioned_profile, profile.uid
-
-    open_sentinels = list(Sentinel.objects.filter(trigger=0, profile=profile, action="logs"))
-    len(open_sentinels) == 0 and Sentinel.objects.create(trigger=0, profile=profile, action="logs", metadata=metadata)
-    for sentinel in open_sentinels:
-        sentinel.metadata.get("snoop", -1) == metadata.get("snoop", -1) and sentinel.update(metadata=metadata)
-
     _area = f'Area {metadata["area"]}'
     if metadata.get("snoop", None):
         return {
@@ -804,6 +816,48 @@ def logs(client, tokens, message, server, profile, msg, help=None):
     }
 
 
+@register({"craftable", "cr"})
+def craftable(client, tokens, message, server, profile, msg, help=None):
+    """
+    # Craftable Help
+    Find out how many of every gear and food recipe you could craft with your current inventory!
+
+    «Every recipe is checked against the same inventory, trading and dismantling
+    whatever you have according to the trade rates of your area.»
+
+    The command assumes you are in A5 if no area is provided.
+
+    ## Usage
+        • `rcd craftable|cr [a{n}=a5] [@player=@you]`
+
+    ## Examples
+        • `rcd craftable` assuming that I am in A5, what could I craft?
+        • `rcd cr a10` now that I am in A10, what could I craft?
+        • `rcd cr @kevin` what could Kevin craft?
+
+    """
+    if help or not tokens:
+        return {"msg": HelpMessage(craftable.__doc__)}
+
+    metadata = _inventory_sentinel("craftable", client, tokens, message, server, profile)
+    if metadata is None:
+        return {"msg": ErrorMessage("Only areas 1-15 are valid!", title="Craftable Error")}
+
+    _area = f'Area {metadata["area"]}'
+    if metadata.get("snoop", None):
+        return {
+            "msg": NormalMessage(
+                "Busybody, eh? Okay, I'll check next time they open their inventory.", title=f"Snoop Crafts ({_area})"
+            )
+        }
+    return {
+        "msg": NormalMessage(
+            "Okay, the next time I see your inventory, I'll say what you can craft.",
+            title=f"Craftable ({_area})",
+        )
+    }
+
+
 @register({"stats", "statistics", "s"})
 def stats_namespace(client, tokens, message, server, profile, msg, help=None):
     """
@@ -2,19 +2,23 @@ import collections
 import functools
 import re
 
+from django.db import transaction
+
 from epic.models import Profile, Channel
-from epic.types.classes import ErrorMessage, RCDMessage
+from epic.types.classes import ErrorMessage, RCDMessage, HelpMessage
 
 ParamTuple = collections.namedtuple("ParamTuple", "client,tokens,message,server,profile,msg,help")
 
 
 def init_registry(*wrappers):
     registry, token_map, admin_protected = [], {}, {}
+    # used by dispatch to jump straight to the commands that can match a token
+    token_index, pattern_index, unfiltered = collections.defaultdict(list), [], []
     admin_command_entry_tokens = set()
     help_tokens = {"h", "help"}
 
     def token_filter(func, acceptable_tokens, patterns=None, filter_funcs=None):
-        patterns = [] if not patterns else patterns
+        patterns = [] if not patterns else [re.compile(pattern) for pattern in patterns]
         acceptable_tokens = set() if not acceptable_tokens else acceptable_tokens
         filter_funcs = [] if not filter_funcs else filter_funcs
 
@@ -26,7 +30,7 @@ def init_registry(*wrappers):
                 if not any(f(params) for f in filter_funcs):
                     return
             if entry_token not in acceptable_tokens and entry_token not in help_tokens:
-                if not any(re.match(pattern, entry_token) for pattern in patterns):
+                if not any(pattern.match(entry_token) for pattern in patterns):
                     return  # not an invocation of this command
             return func(*params)
 
@@ -63,11 +67,20 @@ def init_registry(*wrappers):
             _cmd.entry_tokens, _cmd.entry_patterns, _cmd.param_filters = entry_tokens, entry_patterns, param_filters
             for key, value in kwargs.items():
                 setattr(_cmd, key, value)
+            if _cmd.__doc__:
+                # warm the help markup cache so the first `rcd help` is not slower than the rest
+                HelpMessage.parse(_cmd.__doc__)
             registry.append(_cmd)
+            index = len(registry) - 1
             if entry_tokens:
                 for token in entry_tokens:
                     # index of the function tied to the token
-                    token_map[token] = len(registry) - 1
+                    token_map[token] = index
+                    token_index[token].append(index)
+            if entry_patterns:
+                pattern_index.append((index, [re.compile(pattern) for pattern in entry_patterns]))
+            if not (entry_tokens or entry_patterns or param_filters):
+                unfiltered.append(index)
             return _cmd
 
         if callable(cmd):
@@ -78,13 +91,55 @@ def init_registry(*wrappers):
     def command_by_token(token):
         return token_map[token]
 
+    def next_command(params, position):
+        """
+        Index of the next command after ``position`` which could accept the current tokens, if any.
+        """
+        tokens = params.get("tokens", None)
+        entry_token = tokens[0] if tokens else ""
+        if entry_token in help_tokens:
+            return position + 1 if position + 1 < len(registry) else None
+        candidates = [i for i in token_index.get(entry_token, ()) if i > position]
+        candidates.extend(i for i in unfiltered if i > position)
+        candidates.extend(
+            i for i, patterns in pattern_index if i > position and any(p.match(entry_token) for p in patterns)
+        )
+        return min(candidates, default=None)
+
+    # every wrapper applied to a command which never accepts anything
+    noop = functools.reduce(lambda _cmd, w: w(_cmd), wrappers, lambda *args: None)
+
+    def dispatch(params):
+        """
+        Same as running ``params`` through every command in the registry in order, but
+        skips the commands which cannot accept the current entry token.
+        """
+        position = 0
+        while True:
+            params.update(registry[position](params))
+            if params.get("msg", None) or params.get("error", None) or params.get("coro", None):
+                return params
+            _next = next_command(params, position)
+            if _next is None:
+                break
+            position = _next
+        if position < len(registry) - 1:
+            # the skipped commands would still have had their wrappers run
+            params.update(noop(params))
+        return params
+
     register.registry = registry
     register.admin_protected = admin_protected
     register.admin_command_entry_tokens = admin_command_entry_tokens
     register.command_by_token = command_by_token
+    register.dispatch = dispatch
     return register
 
 
+# channels which are known to have been recorded by this process
+_known_channels = set()
+
+
 def params_as_args(func):
     arg_names = ["client", "tokens", "message", "server", "profile", "msg", "help"]
 
@@ -99,8 +154,8 @@ def params_as_args(func):
         if params["profile"] is None:
             message, server, tokens, help = params["message"], params["server"], params["tokens"], params["help"]
             if server is not None:
-                profile, created = Profile.objects.get_or_create(
-                    uid=message.author.id,
+                profile, created = Profile.get_or_create_cached(
+                    message.author.id,
                     defaults={
                         "last_known_nickname": message.author.name,
                         "server": server,
@@ -110,13 +165,16 @@ def params_as_args(func):
                 if not created and profile.server_id != server.id:
                     profile.update(server_id=server.id)
                 # just keeping track of used channels
-                _channel, _ = Channel.objects.get_or_create(
-                    id=message.channel.id,
-                    defaults={
-                        "name_at_creation": message.channel.name,
-                        "server_id": server.id,
-                    },
-                )
+                if message.channel.id not in _known_channels:
+                    Channel.objects.get_or_create(
+                        id=message.channel.id,
+                        defaults={
+                            "name_at_creation": message.channel.name,
+                            "server_id": server.id,
+                        },
+                    )
+                    channel_id = message.channel.id
+                    transaction.on_commit(lambda: _known_channels.add(channel_id))
                 params["profile"] = profile
             elif not help and tokens and tokens[0] not in {"h", "help", "register", "join"}:
                 params["msg"] = ErrorMessage(
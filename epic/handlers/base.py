@@ -3,8 +3,9 @@ from typing import List, Optional, Callable, Union
 
 from asgiref.sync import sync_to_async
 
+from epic.cache import MISSING
 from epic.models import Server
-from epic.types.classes import RCDMessage, Namespace
+from epic.types.classes import RCDMessage, Namespace, MessageView
 
 
 class Handler:
@@ -19,16 +20,26 @@ class Handler:
 
     def __init__(self, client, incoming, server=None):
         self.client = client
-        self.incoming = Namespace.from_collection(incoming)
+        if isinstance(incoming, (dict, list, Namespace)):
+            # replayed history and tests
+            self.incoming = Namespace.from_collection(incoming)
+        else:
+            self.incoming = MessageView(incoming)
         self.content = self.incoming.content[: self.content_limit].lower()
         self._server = server
 
     def should_trigger(self):
         return self.incoming.content.startswith(self.trigger)
 
+    def _guild_id(self):
+        # direct messages do not belong to a guild
+        guild = getattr(self.incoming.channel, "guild", None)
+        return guild.id if guild else None
+
     def _get_server(self) -> Optional[Server]:
         if not self._server and self._server_unset:
-            self._server = Server.objects.filter(id=self.incoming.channel.guild.id).first()
+            guild_id = self._guild_id()
+            self._server = Server.from_guild_id(guild_id) if guild_id else None
             self._server_unset = False
         return self._server
 
@@ -37,7 +48,12 @@ class Handler:
         return self._get_server()
 
     async def aget_server(self):
-        return await sync_to_async(self._get_server)()
+        if not self._server and self._server_unset:
+            # skip the thread hop when the server is already cached
+            server = Server.from_cache(self._guild_id())
+            if server is not MISSING:
+                self._server, self._server_unset = server, False
+        return await sync_to_async(self._get_server)() if self._server_unset else self._server
 
     def handle(self):
         raise NotImplemented()
@@ -0,0 +1,50 @@
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+EPIC_RPG_ID = 555955826880413696
+
+# what kind of handler, if any, a message should be routed to
+RCD, RPG, EPIC_RPG = "rcd", "rpg", "epic_rpg"
+
+# only looks at the first word; the handlers do the real tokenizing
+_prefix_regex = re.compile(r"\s*(r[cr]d|rpg)(?:\s|$)", re.IGNORECASE)
+
+
+class MessageFilter:
+    """
+    Cheap classification of incoming messages so plain chat never reaches a handler.
+    Keeps counts of how many messages were seen and dropped.
+    """
+
+    log_every = 10000
+
+    def __init__(self):
+        self.seen = self.dropped = 0
+
+    @property
+    def drop_ratio(self) -> float:
+        return self.dropped / self.seen if self.seen else 0.0
+
+    def _count(self, kind):
+        self.seen += 1
+        if kind is None:
+            self.dropped += 1
+        if self.seen % self.log_every == 0:
+            logger.info("dropped %d of %d messages (%.1f%%)", self.dropped, self.seen, 100 * self.drop_ratio)
+        return kind
+
+    def classify(self, message, user=None):
+        author = message.author
+        if author.id == EPIC_RPG_ID:
+            return self._count(EPIC_RPG)
+        if author == user:
+            return self._count(None)
+        match = _prefix_regex.match(message.content)
+        if not match:
+            return self._count(None)
+        return self._count(RPG if match.group(1).lower() == "rpg" else RCD)
+
+    def classify_edit(self, message):
+        return self._count(EPIC_RPG if message.author.id == EPIC_RPG_ID and message.embeds else None)
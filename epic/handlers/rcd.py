@@ -1,4 +1,4 @@
-from epic.cmd import handle_rcd_command
+from epic.cmd import dispatch_rcd_command
 from epic.handlers.base import Handler
 from epic.types import HandlerResult
 from epic.utils import tokenize
@@ -14,7 +14,7 @@ class RCDHandler(Handler):
 
     @property
     def should_trigger(self):
-        if self.tokens and self.client.user != self.incoming.author:
+        if self.tokens and self.incoming.author != self.client.user:
             if self.server:
                 return self.server.active
             return True
@@ -23,4 +23,4 @@ class RCDHandler(Handler):
     def handle(self) -> HandlerResult:
         if not self.should_trigger:
             return [], (None, ())
-        return handle_rcd_command(self.client, self.tokens, self.incoming, self.server, None, None)
+        return dispatch_rcd_command(self.client, self.tokens, self.incoming, self.server, None, None)
@@ -20,13 +20,13 @@ class CoolDownHandler(Handler):
 
     @property
     def should_trigger(self):
-        return self.tokens and self.client.user != self.incoming.author and self.server and self.server.active
+        return self.tokens and self.incoming.author != self.client.user and self.server and self.server.active
 
     @property
     def profile(self):
         if not self._profile:
-            self._profile, _ = Profile.objects.get_or_create(
-                uid=self.incoming.author.id,
+            self._profile, _ = Profile.get_or_create_cached(
+                self.incoming.author.id,
                 defaults={
                     "last_known_nickname": self.incoming.author.name,
                     "server": self.server,
@@ -38,7 +38,7 @@ class CoolDownHandler(Handler):
     def handle(self):
         if not self.should_trigger:
             return
-        cooldown_type, default_duration, tokens = CoolDown.default_cmd_cd(self.content[3:])
+        cooldown_type, default_duration, tokens = CoolDown.default_cmd_cd(self.content[3:], self.tokens)
         if not cooldown_type:
             return
         if self.profile.server_id != self.server.id or self.profile.channel != self.incoming.channel.id:
@@ -53,7 +53,7 @@ class CoolDownHandler(Handler):
                 # need to know the difference between dungeon and miniboss here
                 cooldown_type = "miniboss" if tokens[0] == "miniboss" else cooldown_type
                 return GroupActivity.create_from_tokens(
-                    cooldown_type, self.client, self.profile, self.server, self.incoming
+                    cooldown_type, self.client, self.profile, self.server, self.incoming, tokens
                 )
             else:
                 Sentinel.objects.create(profile=self.profile, trigger=3, metadata=dict(cooldown_type=cooldown_type))
@@ -91,21 +91,24 @@ class RPGHandler(Handler):
             if cue in self.embed.author.name:
                 return cue
 
+    def user_ids_for_name(self, name):
+        member_index = getattr(self.client, "member_index", None)
+        if member_index is not None:
+            return member_index.ids_for_name(name)
+        return [str(m.id) for m in self.client.get_all_members() if name == m.name]
+
     def process_hunt_response(self):
         hunt_result = Hunt.hunt_result_from_message(self.incoming)
         if hunt_result:
             name, *other = hunt_result
-            possible_userids = [str(m.id) for m in self.client.get_all_members() if name == m.name]
-            return update_hunt_results(other, possible_userids)
+            return update_hunt_results(other, self.user_ids_for_name(name))
 
         hunt_together_result = Hunt.hunt_together_from_message(self.incoming)
         if not hunt_together_result:
             return
-        all_members = set(self.client.get_all_members())
         for hunt_result in hunt_together_result:
             name, *other = hunt_result
-            possible_userids = [str(m.id) for m in all_members if name == m.name]
-            update_hunt_results(other, possible_userids)
+            update_hunt_results(other, self.user_ids_for_name(name))
 
     def handle_arena(self):
         arena_match = GroupActivity.REGEX_MAP["arena"].search(str(self.embed.description))
@@ -168,6 +171,8 @@ class RPGHandler(Handler):
 
 class GuildListHandler(Handler):
     embed = None
+    guild_name_regex = re.compile(r"\*\*(?P<guild_name>[^\*]+)\*\* members")
+    player_name_regex = re.compile(r"\*\*(?P<player_name>[^\*]+)\*\*")
 
     def __init__(self, client, incoming, server=None):
         super().__init__(client, incoming, server)
@@ -181,22 +186,27 @@ class GuildListHandler(Handler):
             str(self.incoming.author) == "EPIC RPG#4117" and self.server and self.server.active and self.incoming.embeds
         )
 
+    def user_id_for_tag(self, name, discriminator):
+        member_index = getattr(self.client, "member_index", None)
+        if member_index is not None:
+            return member_index.id_for_tag(name, discriminator)
+        user = discord.utils.get(self.client.get_all_members(), name=name, discriminator=discriminator)
+        return user.id if user else None
+
     def handle(self):
-        guild_name_regex = re.compile(r"\*\*(?P<guild_name>[^\*]+)\*\* members")
-        player_name_regex = re.compile(r"\*\*(?P<player_name>[^\*]+)\*\*")
         guild_membership = {}
         guild_id_map = {}
         for field in self.embed.fields:
-            name_match = guild_name_regex.match(field.name)
+            name_match = self.guild_name_regex.match(field.name)
             if name_match:
-                guild_membership[name_match.group(1)] = player_name_regex.findall(field.value)
+                guild_membership[name_match.group(1)] = self.player_name_regex.findall(field.value)
         for guild, membership_set in guild_membership.items():
             guild_id_map[guild] = []
             for member in membership_set:
                 # careful in case name contains multiple #
                 split_name = member.split("#")
                 name, discriminator = "#".join(split_name[:-1]), split_name[-1]
-                user = discord.utils.get(self.client.get_all_members(), name=name, discriminator=discriminator)
-                if user:
-                    guild_id_map[guild].append(user.id)
+                user_id = self.user_id_for_tag(name, discriminator)
+                if user_id:
+                    guild_id_map[guild].append(user_id)
         _set_guild_membership(guild_id_map)
@@ -1,5 +1,7 @@
 import re
-from typing import Tuple
+import time
+import functools
+from typing import Tuple, Dict, Optional
 
 from epic.crafting import Inventory
 
@@ -11,71 +13,102 @@ except ImportError:
     FUTURE_AVAILABLE = False
 
 
-patterns = [
-    re.compile(r"\*\*apple\*\*: (?P<apple>\d+)"),
-    re.compile(r"\*\*banana\*\*: (?P<banana>\d+)"),
-    re.compile(r"\*\*normie fish\*\*: (?P<normie_fish>\d+)"),
-    re.compile(r"\*\*golden fish\*\*: (?P<golden_fish>\d+)"),
-    re.compile(r"\*\*EPIC fish\*\*: (?P<epic_fish>\d+)"),
-    re.compile(r"\*\*wooden log\*\*: (?P<wooden_log>\d+)"),
-    re.compile(r"\*\*EPIC log\*\*: (?P<epic_log>\d+)"),
-    re.compile(r"\*\*SUPER log\*\*: (?P<super_log>\d+)"),
-    re.compile(r"\*\*MEGA log\*\*: (?P<mega_log>\d+)"),
-    re.compile(r"\*\*HYPER log\*\*: (?P<hyper_log>\d+)"),
-    re.compile(r"\*\*ULTRA log\*\*: (?P<ultra_log>\d+)"),
-    re.compile(r"\*\*wolf skin\*\*: (?P<wolf_skin>\d+)"),
-    re.compile(r"\*\*zombie eye\*\*: (?P<zombie_eye>\d+)"),
-    re.compile(r"\*\*unicorn horn\*\*: (?P<unicorn_horn>\d+)"),
-    re.compile(r"\*\*mermaid hair\*\*: (?P<mermaid_hair>\d+)"),
-    re.compile(r"\*\*chip\*\*: (?P<chip>\d+)"),
-    re.compile(r"\*\*dragon scale\*\*: (?P<dragon_scale>\d+)"),
-    re.compile(r"\*\*common lootbox\*\*: (?P<common>\d+)"),
-    re.compile(r"\*\*uncommon lootbox\*\*: (?P<uncommon>\d+)"),
-    re.compile(r"\*\*rare lootbox\*\*: (?P<rare>\d+)"),
-    re.compile(r"\*\*EPIC lootbox\*\*: (?P<epic>\d+)"),
-    re.compile(r"\*\*EDGY lootbox\*\*: (?P<edgy>\d+)"),
-    re.compile(r"\*\*OMEGA lootbox\*\*: (?P<omega>\d+)"),
-    re.compile(r"\*\*GODLY lootbox\*\*: (?P<godly>\d+)"),
-    re.compile(r"\*\*arena cookie\*\*: (?P<cookie>\d+)"),
-    re.compile(r"\*\*potato\*\*: (?P<potato>\d+)"),
-    re.compile(r"\*\*carrot\*\*: (?P<carrot>\d+)"),
-    re.compile(r"\*\*bread\*\*: (?P<bread>\d+)"),
-]
-
-
-def parse_inventory(*values):
+# name in the inventory embed -> item name
+inventory_items = {
+    "apple": "apple",
+    "banana": "banana",
+    "normie fish": "normie_fish",
+    "golden fish": "golden_fish",
+    "EPIC fish": "epic_fish",
+    "wooden log": "wooden_log",
+    "EPIC log": "epic_log",
+    "SUPER log": "super_log",
+    "MEGA log": "mega_log",
+    "HYPER log": "hyper_log",
+    "ULTRA log": "ultra_log",
+    "wolf skin": "wolf_skin",
+    "zombie eye": "zombie_eye",
+    "unicorn horn": "unicorn_horn",
+    "mermaid hair": "mermaid_hair",
+    "chip": "chip",
+    "dragon scale": "dragon_scale",
+    "common lootbox": "common",
+    "uncommon lootbox": "uncommon",
+    "rare lootbox": "rare",
+    "EPIC lootbox": "epic",
+    "EDGY lootbox": "edgy",
+    "OMEGA lootbox": "omega",
+    "GODLY lootbox": "godly",
+    "arena cookie": "cookie",
+    "potato": "potato",
+    "carrot": "carrot",
+    "bread": "bread",
+}
+
+# every **item**: qty pair, items we don't track are skipped
+inventory_regex = re.compile(r"\*\*([^*]+)\*\*: (\d+)")
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_inventory(full_string: str) -> Tuple[Tuple[str, int], ...]:
     inventory = {}
-    full_string = "\n".join(values)
-    for pattern in patterns:
-        match = pattern.search(full_string)
-        if match:
-            inventory.update(match.groupdict())
-    return inventory
+    for name, qty in inventory_regex.findall(full_string):
+        item = inventory_items.get(name)
+        # the first mention of an item is the one that counts
+        if item and item not in inventory:
+            inventory[item] = int(qty)
+    return tuple(inventory.items())
+
+
+def parse_inventory(*values) -> Dict[str, int]:
+    return dict(_parse_inventory("\n".join(values)))
+
+
+def _inventory(area: int, items: Dict[str, int]):
+    return crafting.Inventory(area, **items)
 
 
-def calculate_log_future(area: int, *values: Tuple[str]):
+def calculate_log_future(area: int, items: Dict[str, int]):
     if not FUTURE_AVAILABLE:
         return 0, False
-    return crafting.Inventory(area, **{name: int(qty) for name, qty in parse_inventory(*values).items()}).future(), True
+    return _inventory(area, items).future(), True
 
 
-def can_craft(area: int, recipe: Inventory, *values: Tuple[str]):
+def can_craft(area: int, recipe: Inventory, items: Dict[str, int]):
     if not FUTURE_AVAILABLE:
         return False, False
-    return (
-        crafting.can_craft(
-            recipe, crafting.Inventory(area, **{name: int(qty) for name, qty in parse_inventory(*values).items()})
-        ),
-        True,
-    )
+    return crafting.can_craft(recipe, _inventory(area, items)), True
 
 
-def how_many(area: int, recipe: Inventory, *values: Tuple[str]):
+def how_many(area: int, recipe: Inventory, items: Dict[str, int]):
     if not FUTURE_AVAILABLE:
         return 0, None
-    return crafting.how_many(
-        recipe, crafting.Inventory(area, **{name: int(qty) for name, qty in parse_inventory(*values).items()})
-    )
+    return crafting.how_many(recipe, _inventory(area, items))
+
+
+# craftable is answered along with the player's other inventory requests, so it only gets this many seconds
+CRAFTABLE_BUDGET = 1.0
+# recipes handed to materials at once, the budget is checked between batches
+CRAFTABLE_BATCH = 8
+
+
+def craftable(area: int, items: Dict[str, int]) -> Tuple[Dict[str, Optional[int]], bool]:
+    """
+    How many of every gear and food recipe the (parsed) inventory could craft, evaluated in batches
+    until ``CRAFTABLE_BUDGET`` runs out. Recipes that weren't reached in time are ``None``.
+    """
+    if not FUTURE_AVAILABLE:
+        return {}, False
+    recipes = {name: recipe for name, recipe in crafting.recipes.full_map.items() if isinstance(recipe, Inventory)}
+    names, inventory, counts = list(recipes), _inventory(area, items), {}
+    deadline = time.monotonic() + CRAFTABLE_BUDGET
+    for start in range(0, len(names), CRAFTABLE_BATCH):
+        if time.monotonic() > deadline:
+            break
+        batch = names[start : start + CRAFTABLE_BATCH]
+        results = crafting.how_many_batch([recipes[name] for name in batch], inventory)
+        counts.update((name, amount) for name, (amount, _) in zip(batch, results))
+    return {name: counts.get(name) for name in names}, True
 
 
 if __name__ == "__main__":
@@ -89,4 +122,4 @@ if __name__ == "__main__":
         "\n<:unicornhorn:545329267425149112> **unicorn horn**: 19"
         "\n<:dragonscale:619991355317289007> **dragon scale**: 3",
     )
-    print(calculate_log_future(5, inventory))
+    print(calculate_log_future(5, parse_inventory(*inventory)))
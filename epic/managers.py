@@ -14,6 +14,23 @@ class ProfileManager(models.Manager):
         return self.active().filter(**{command_type: True})
 
 
+class CoolDownManager(models.Manager):
+    def due(self, now, cooldown_types):
+        # per type notification flags live on the profile, pick the matching one for each row
+        enabled = Case(
+            *(When(type=cd_type, then=F(f"profile__{cd_type}")) for cd_type in cooldown_types),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        )
+        return (
+            self.get_queryset()
+            .filter(after__lte=now, type__in=cooldown_types, profile__notify=True, profile__server__active=True)
+            .exclude(profile__banned=True)
+            .annotate(enabled=enabled)
+            .filter(enabled=True)
+        )
+
+
 class GamblingStatsManager(models.Manager):
     def stats(self, profile_uid=None, minutes=None, server_id=None):
         game_case = Case(
@@ -0,0 +1,84 @@
+import threading
+
+from collections import defaultdict, Counter
+from typing import Iterable, List, Optional
+
+
+class MemberIndex:
+    """
+    Lookup of the members the client can see by name and by name#discriminator, kept
+    up to date from gateway events so handlers don't need to scan ``client.get_all_members()``.
+
+    The same user shows up once per guild they share with the client, so every
+    user id keeps a count of how many guilds it was seen in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_name = defaultdict(Counter)
+        self._by_tag = {}
+
+    def _add(self, member):
+        self._by_name[member.name][member.id] += 1
+        self._by_tag[(member.name, member.discriminator)] = member.id
+
+    def _remove(self, member):
+        ids = self._by_name.get(member.name)
+        if not ids or member.id not in ids:
+            return
+        ids[member.id] -= 1
+        if ids[member.id] <= 0:
+            del ids[member.id]
+            self._by_tag.pop((member.name, member.discriminator), None)
+        if not ids:
+            del self._by_name[member.name]
+
+    def rebuild(self, members: Iterable):
+        with self._lock:
+            self._by_name.clear()
+            self._by_tag.clear()
+            for member in members:
+                self._add(member)
+
+    def add(self, member):
+        with self._lock:
+            self._add(member)
+
+    def add_all(self, members: Iterable):
+        with self._lock:
+            for member in members:
+                self._add(member)
+
+    def remove(self, member):
+        with self._lock:
+            self._remove(member)
+
+    def remove_all(self, members: Iterable):
+        with self._lock:
+            for member in members:
+                self._remove(member)
+
+    def rename(self, before, after):
+        if (before.name, before.discriminator) == (after.name, after.discriminator):
+            return
+        with self._lock:
+            ids = self._by_name.get(before.name)
+            count = ids.pop(before.id, 0) if ids else 0
+            if not count:
+                return
+            if not ids:
+                del self._by_name[before.name]
+            self._by_tag.pop((before.name, before.discriminator), None)
+            self._by_name[after.name][after.id] += count
+            self._by_tag[(after.name, after.discriminator)] = after.id
+
+    def ids_for_name(self, name: str) -> List[str]:
+        with self._lock:
+            return [str(user_id) for user_id in self._by_name.get(name, ())]
+
+    def id_for_tag(self, name: str, discriminator: str) -> Optional[int]:
+        with self._lock:
+            return self._by_tag.get((name, discriminator))
+
+    def __len__(self):
+        return len(self._by_name)
@@ -0,0 +1,28 @@
+# Generated by Django 3.2 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic", "0022_area"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="sentinel",
+            name="action",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("logs", "Logs"),
+                    ("can_craft", "Can Craft"),
+                    ("how_many", "How Many"),
+                    ("craftable", "Craftable"),
+                ],
+                max_length=10,
+                null=True,
+            ),
+        ),
+    ]
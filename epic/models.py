@@ -1,4 +1,5 @@
 import re
+import copy
 from typing import Optional, Tuple, Union, List, Dict
 
 import pytz
@@ -13,11 +14,20 @@ from django.db import models, transaction
 from django.core.validators import MaxValueValidator, MinValueValidator
 
 from . import inventory
+from .cache import TTLCache, MISSING
 from .mixins import UpdateAble
+from .reminders import scheduler
 from .types import HandlerResult
 from .utils import tokenize, defaults_from, cast
 from .types.classes import RCDMessage, ErrorMessage, NormalMessage, SuccessMessage
-from .managers import ProfileManager, GamblingStatsManager, HuntManager, GroupActivityManager, EventQuerySet
+from .managers import (
+    ProfileManager,
+    CoolDownManager,
+    GamblingStatsManager,
+    HuntManager,
+    GroupActivityManager,
+    EventQuerySet,
+)
 
 
 class JoinCode(models.Model):
@@ -38,6 +48,40 @@ class Server(models.Model):
     code = models.OneToOneField(JoinCode, null=True, blank=True, on_delete=models.SET_NULL)
     active = models.BooleanField(default=True)
 
+    # guild id -> Server, None for guilds which have not registered
+    cache = TTLCache(maxsize=4096, ttl=600)
+
+    @staticmethod
+    def from_cache(guild_id):
+        """
+        A copy of the cached server, ``None`` for unregistered guilds or ``MISSING`` if nothing is cached.
+        """
+        server = Server.cache.get(guild_id)
+        return server if server is None or server is MISSING else server._detached_copy()
+
+    @staticmethod
+    def from_guild_id(guild_id) -> Optional["Server"]:
+        server = Server.from_cache(guild_id)
+        if server is MISSING:
+            server = Server.objects.filter(id=guild_id).first()
+            Server.cache.set(guild_id, server._detached_copy() if server else None)
+        return server
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Server.cache.set_on_commit(self.id, self._detached_copy())
+
+    def delete(self, *args, **kwargs):
+        Server.cache.invalidate(self.id)
+        return super().delete(*args, **kwargs)
+
+    def _detached_copy(self):
+        # cached servers are shared between threads, so only ever hand out copies
+        clone = copy.copy(self)
+        clone._state = copy.copy(self._state)
+        clone._state.fields_cache = {}
+        return clone
+
     def __str__(self):
         return f"{self.name}({self.id}) joined with {self.code}"
 
@@ -60,6 +104,7 @@ class Guild(UpdateAble, models.Model):
             None if profile.player_guild.raid_dibbs_id == profile.uid else profile.player_guild.raid_dibbs_id
         )
         profile.player_guild.update(after=after, raid_dibbs_id=raid_dibbs_id)
+        scheduler.schedule_guild(profile.player_guild.name, after)
 
     def __str__(self):
         return self.name
@@ -110,17 +155,46 @@ class Profile(UpdateAble, models.Model):
     pet = models.BooleanField(default=True)
 
     objects = ProfileManager()
+    # uid -> Profile, written through on save
+    cache = TTLCache(maxsize=2048, ttl=300)
 
     def __str__(self):
         return f"{self.last_known_nickname}({self.uid})"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Profile.cache.set_on_commit(str(self.uid), self._detached_copy())
+
+    def delete(self, *args, **kwargs):
+        Profile.cache.invalidate(str(self.uid))
+        return super().delete(*args, **kwargs)
+
+    def _detached_copy(self):
+        # cached profiles are shared between threads, so only ever hand out copies
+        clone = copy.copy(self)
+        clone._state = copy.copy(self._state)
+        clone._state.fields_cache = {}
+        clone.uid = str(self.uid)
+        return clone
+
+    @staticmethod
+    def get_or_create_cached(uid, defaults=None) -> Tuple["Profile", bool]:
+        uid = str(uid)
+        profile = Profile.cache.get(uid)
+        if profile is not MISSING:
+            return profile._detached_copy(), False
+        profile, created = Profile.objects.get_or_create(uid=uid, defaults=defaults)
+        if not created:
+            Profile.cache.set_on_commit(uid, profile._detached_copy())
+        return profile, created
+
     @staticmethod
     def from_tag(tag, client, server, message):
         maybe_user_id = Profile.user_id_regex.match(tag)
         if maybe_user_id:
             user_id = int(maybe_user_id.group(1))
-            profile, _ = Profile.objects.get_or_create(
-                uid=user_id,
+            profile, _ = Profile.get_or_create_cached(
+                user_id,
                 defaults={
                     "last_known_nickname": client.get_user(user_id).name,
                     "server": server,
@@ -135,8 +209,8 @@ class Profile(UpdateAble, models.Model):
             user_id = embed.author.icon_url.strip("https://cdn.discordapp.com/avatars/").split("/")[0]
             user = client.get_user(int(user_id))
             if user:
-                profile, _ = Profile.objects.get_or_create(
-                    uid=user_id,
+                profile, _ = Profile.get_or_create_cached(
+                    user_id,
                     defaults={
                         "last_known_nickname": user.name,
                         "server": server,
@@ -210,58 +284,60 @@ class CoolDown(models.Model):
         "have been in a fight with a boss": "dungeon",
         "guild has already raided": "guild",
     }
-    COMMAND_RESOLUTION_MAP = {
-        "daily": lambda x: "daily",
-        "weekly": lambda x: "weekly",
-        "buy": lambda x: "lootbox" if "lootbox" in x else None,
-        "vote": lambda x: "vote",
-        "hunt": lambda x: "hunt",
-        "adv": lambda x: "adventure",
-        "adventure": lambda x: "adventure",
-        "farm": lambda x: "farm",
-        "quest": lambda x: "quest",
-        "epic": lambda x: "quest" if "quest" in x else None,
-        "tr": lambda x: "training",
-        "training": lambda x: "training",
-        "ultr": lambda x: "training",
-        "ultraining": lambda x: "training",
-        "duel": lambda x: "duel",
-        "mine": lambda x: "work",
-        "pickaxe": lambda x: "work",
-        "drill": lambda x: "work",
-        "dynamite": lambda x: "work",
-        "pickup": lambda x: "work",
-        "ladder": lambda x: "work",
-        "tractor": lambda x: "work",
-        "greenhouse": lambda x: "work",
-        "chop": lambda x: "work",
-        "axe": lambda x: "work",
-        "bowsaw": lambda x: "work",
-        "chainsaw": lambda x: "work",
-        "fish": lambda x: "work",
-        "net": lambda x: "work",
-        "boat": lambda x: "work",
-        "bigboat": lambda x: "work",
-        "horse": lambda x: "horse" if any([o in x for o in ["breed", "breeding", "race"]]) else None,
-        "arena": lambda x: "arena",
-        "big": lambda x: "arena" if "arena join" in x else None,
-        "dung": lambda x: "dungeon",
-        "dungeon": lambda x: "dungeon",
-        "miniboss": lambda x: "dungeon",
-        "not": lambda x: "dungeon" if "so mini boss join" in x else None,
-        "guild": lambda x: "guild" if any([o in x for o in ("raid", "upgrade")]) else None,
-        "pet": lambda x: "pet" if re.match(r"(adv|adventure) (find|learn|drill) [a-z]{1,2}", x) else None,
-        "pets": lambda x: "pet" if re.match(r"(adv|adventure) (find|learn|drill) [a-z]{1,2}", x) else None,
+    # command -> (pattern the rest of the command must contain, if any; cooldown type)
+    COMMAND_RESOLUTION_TABLE = {
+        "daily": (None, "daily"),
+        "weekly": (None, "weekly"),
+        "buy": (re.compile(r"lootbox"), "lootbox"),
+        "vote": (None, "vote"),
+        "hunt": (None, "hunt"),
+        "adv": (None, "adventure"),
+        "adventure": (None, "adventure"),
+        "farm": (None, "farm"),
+        "quest": (None, "quest"),
+        "epic": (re.compile(r"quest"), "quest"),
+        **{command: (None, "training") for command in ("tr", "training", "ultr", "ultraining")},
+        "duel": (None, "duel"),
+        **{
+            command: (None, "work")
+            for command in (
+                *("mine", "pickaxe", "drill", "dynamite"),
+                *("pickup", "ladder", "tractor", "greenhouse"),
+                *("chop", "axe", "bowsaw", "chainsaw"),
+                *("fish", "net", "boat", "bigboat"),
+            )
+        },
+        "horse": (re.compile(r"breed|race"), "horse"),
+        "arena": (None, "arena"),
+        "big": (re.compile(r"arena join"), "arena"),
+        **{command: (None, "dungeon") for command in ("dung", "dungeon", "miniboss")},
+        "not": (re.compile(r"so mini boss join"), "dungeon"),
+        "guild": (re.compile(r"raid|upgrade"), "guild"),
+        **{
+            command: (re.compile(r"^(adv|adventure) (find|learn|drill) [a-z]{1,2}"), "pet")
+            for command in ("pet", "pets")
+        },
     }
 
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
     type = models.CharField(choices=COOLDOWN_TYPE_CHOICES, max_length=10)
     after = models.DateTimeField()
 
+    objects = CoolDownManager()
+    # (cooldown map, active event names), see get_event_cooldown_map
+    event_cooldown_cache = TTLCache(maxsize=1, ttl=3600)
+
     @staticmethod
-    def get_event_cooldown_map() -> Tuple[Dict[str, datetime.timedelta], List[str]]:
+    def _event_cooldown_map() -> Tuple[Dict[str, datetime.timedelta], List[str]]:
+        cached = CoolDown.event_cooldown_cache.get("map")
+        if cached is not MISSING:
+            return cached
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         cooldown_map = CoolDown.COOLDOWN_MAP.copy()
-        active_events = Event.objects.active().values("cooldown_multipliers", "cooldown_adjustments", "event_name")
+        events = Event.objects.filter(end__gt=now).values(
+            "cooldown_multipliers", "cooldown_adjustments", "event_name", "start", "end"
+        )
+        active_events = [event for event in events if event["start"] < now]
         for event in active_events:
             if event["cooldown_multipliers"]:
                 cooldown_map.update({k: cooldown_map[k] * v for k, v in event["cooldown_multipliers"].items()})
@@ -269,33 +345,53 @@ class CoolDown(models.Model):
                 cooldown_map.update(
                     {k: datetime.timedelta(seconds=v) for k, v in event["cooldown_adjustments"].items()}
                 )
-        return cooldown_map, [e["event_name"] for e in active_events]
+        # the map stays valid until the next time an event starts or ends
+        boundaries = [event["end"] if event["start"] < now else event["start"] for event in events]
+        ttl = CoolDown.event_cooldown_cache.ttl
+        if boundaries:
+            ttl = min((min(boundaries) - now).total_seconds(), ttl)
+        result = (cooldown_map, [e["event_name"] for e in active_events])
+        CoolDown.event_cooldown_cache.set_on_commit("map", result, ttl=ttl)
+        return result
+
+    @staticmethod
+    def get_event_cooldown_map() -> Tuple[Dict[str, datetime.timedelta], List[str]]:
+        cooldown_map, event_names = CoolDown._event_cooldown_map()
+        return cooldown_map.copy(), event_names.copy()
 
     @staticmethod
     def get_cooldown(cooldown_type, default=None):
         if not cooldown_type in CoolDown.COOLDOWN_MAP:
             return None
-        cooldown_map, _ = CoolDown.get_event_cooldown_map()
+        cooldown_map, _ = CoolDown._event_cooldown_map()
         return cooldown_map.get(cooldown_type, default)
 
     def __str__(self):
         return f"{self.profile} can {self.type} after {self.after}"
 
     @staticmethod
-    def default_cmd_cd(cmd: str) -> Tuple[Optional[str], Optional[datetime.timedelta], List[str]]:
-        tokens = tokenize(cmd)
+    def resolve_command(cmd: str, args: str) -> Optional[str]:
+        condition, cooldown_type = CoolDown.COMMAND_RESOLUTION_TABLE.get(cmd, (None, None))
+        if condition is None or condition.search(args):
+            return cooldown_type
+
+    @staticmethod
+    def default_cmd_cd(
+        cmd: str, tokens: Optional[List[str]] = None
+    ) -> Tuple[Optional[str], Optional[datetime.timedelta], List[str]]:
+        tokens = tokenize(cmd) if tokens is None else tokens
         if not tokens:
             return None, None, []
         # zero argument commands will just return whether the command matched
         if len(tokens) == 1:
-            resolved = CoolDown.COMMAND_RESOLUTION_MAP.get(tokens[0], lambda x: None)("")
+            resolved = CoolDown.resolve_command(tokens[0], "")
         else:
             cmd, *args = tokens
             if cmd == "ascended":
                 cmd, *args = args
                 tokens = [cmd, *args]
             # multi-arguments must be resolved in the basis of other args
-            resolved = CoolDown.COMMAND_RESOLUTION_MAP.get(cmd, lambda x: None)(" ".join(args))
+            resolved = CoolDown.resolve_command(cmd, " ".join(args))
         if not resolved:
             return None, None, tokens
         return resolved, CoolDown.get_cooldown(resolved), tokens
@@ -607,6 +703,8 @@ class GroupActivity(UpdateAble, models.Model):
             *(CoolDown(profile_id=i, type=_type, after=after) for i in invitees),
         ]
         CoolDown.objects.bulk_create(cooldowns, ignore_conflicts=True)
+        # conflicting rows keep their existing reminder, so only wake up for this activity
+        scheduler.schedule(("activity", self.id), after)
         self.delete()
 
     def __str__(self):
@@ -630,6 +728,14 @@ class Event(models.Model):
 
     objects = EventQuerySet.as_manager()
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        CoolDown.event_cooldown_cache.clear()
+
+    def delete(self, *args, **kwargs):
+        CoolDown.event_cooldown_cache.clear()
+        return super().delete(*args, **kwargs)
+
     @staticmethod
     def parse_event(tokens, event_name, upsert=True, tz=None):
         event = Event.objects.filter(event_name__iexact=event_name).first()
@@ -716,6 +822,7 @@ class Sentinel(models.Model):
         ("logs", "Logs"),
         ("can_craft", "Can Craft"),
         ("how_many", "How Many"),
+        ("craftable", "Craftable"),
     )
 
     profile = models.ForeignKey("epic.Profile", on_delete=models.CASCADE)
@@ -729,21 +836,100 @@ class Sentinel(models.Model):
             setattr(self, key, kwargs[key])
         return self.save() or self  # return self if save returns nothing
 
+    # inventory actions in the order their messages are shown
+    INVENTORY_ACTIONS = ("logs", "can_craft", "how_many", "craftable")
+
     @staticmethod
     def act(content, embed, profile: Profile, caller: str) -> HandlerResult:
         results = []
         if caller == "inventory":
-            for trigger in Sentinel.objects.filter(trigger=0, profile__uid=profile.uid, action="logs"):
-                results.extend(trigger.logs_message(embed, profile))
-            for trigger in Sentinel.objects.filter(trigger=0, profile__uid=profile.uid, action="can_craft"):
-                results.extend(trigger.can_craft_message(embed, profile))
-            for trigger in Sentinel.objects.filter(trigger=0, profile__uid=profile.uid, action="how_many"):
-                results.extend(trigger.how_many_message(embed, profile))
+            results = Sentinel.act_on_inventory(embed, profile)
         if caller == "registration_confirmation":
             for trigger in Sentinel.objects.filter(trigger=3, profile__uid=profile.uid):
                 trigger.event_registration_confirmation(content, profile)
         return results, (None, ())
 
+    @staticmethod
+    def act_on_inventory(embed, profile: Profile) -> List[Union[str, RCDMessage]]:
+        """
+        Fulfill every pending inventory sentinel of the profile from a single parse of the inventory
+        and answer with as few messages as discord allows (preceded by any snooping pings).
+        """
+        triggers = list(
+            Sentinel.objects.filter(trigger=0, profile__uid=profile.uid, action__in=Sentinel.INVENTORY_ACTIONS)
+        )
+        if not triggers:
+            return []
+        triggers.sort(key=lambda trigger: (Sentinel.INVENTORY_ACTIONS.index(trigger.action), trigger.id))
+        items = inventory.parse_inventory(*(field.value for field in embed.fields))
+        results = []
+        for trigger in triggers:
+            results.extend(getattr(trigger, f"{trigger.action}_message")(items, profile))
+        with transaction.atomic():
+            deleted, _ = Sentinel.objects.filter(id__in=[trigger.id for trigger in triggers]).delete()
+        if not deleted:
+            # another inventory already answered them
+            return []
+        return Sentinel.combine(results, profile.uid)
+
+    # discord's embed limits
+    FIELD_NAME_LIMIT, FIELD_VALUE_LIMIT, FIELD_COUNT_LIMIT, EMBED_LIMIT = 256, 1024, 25, 6000
+
+    @staticmethod
+    def split_field(name: str, value: str) -> List[Tuple[str, str]]:
+        """
+        Split a field which is too long for discord into several, at line breaks where possible.
+        """
+        fields, name = [], name[: Sentinel.FIELD_NAME_LIMIT]
+        while len(value) > Sentinel.FIELD_VALUE_LIMIT:
+            cut = value.rfind("\n", 0, Sentinel.FIELD_VALUE_LIMIT) + 1 or Sentinel.FIELD_VALUE_LIMIT
+            fields.append((name, value[:cut]))
+            name, value = "\u200b", value[cut:]
+        fields.append((name, value))
+        return fields
+
+    @staticmethod
+    def combine(results: List[Union[str, RCDMessage]], uid: str) -> List[Union[str, RCDMessage]]:
+        pings = [result.strip() for result in results if isinstance(result, str)]
+        title, description = "Inventory", f"<@!{uid}> Here's what I found in your inventory."
+        # room left for the fields of a combined embed
+        budget = Sentinel.EMBED_LIMIT - len(title) - len(description)
+
+        def size(fields):
+            return sum(len(name) + len(value) for name, value in fields)
+
+        # consecutive messages which fit in one embed, and messages which can only be sent on their own
+        groups, separate = [], []
+        for message in (result for result in results if isinstance(result, RCDMessage)):
+            fields = [field for name, value in message.fields for field in Sentinel.split_field(name, value)]
+            if tuple(fields) != message.fields:
+                message = copy.copy(message)
+                message.fields = tuple(fields)
+            fields = [((message.title or "\u200b")[: Sentinel.FIELD_NAME_LIMIT], message.msg or "\u200b"), *fields]
+            if (
+                len(message.msg) > Sentinel.FIELD_VALUE_LIMIT
+                or len(fields) > Sentinel.FIELD_COUNT_LIMIT
+                or size(fields) > budget
+            ):
+                separate.append(message)
+                continue
+            if (
+                not groups
+                or len(groups[-1][1]) + len(fields) > Sentinel.FIELD_COUNT_LIMIT
+                or size(groups[-1][1]) + size(fields) > budget
+            ):
+                groups.append(([], []))
+            groups[-1][0].append(message)
+            groups[-1][1].extend(fields)
+        combined = []
+        for messages, fields in groups:
+            if len(messages) == 1:
+                combined.append(messages[0])
+                continue
+            cls = ErrorMessage if all(isinstance(message, ErrorMessage) for message in messages) else NormalMessage
+            combined.append(cls(description, title=title, fields=fields))
+        return [*(["\n".join(dict.fromkeys(pings))] if pings else []), *combined, *separate]
+
     def event_registration_confirmation(self, content, profile: Profile):
         confirmed = content and "successfully registered" in content
         rejected = content and "already registered" in content
@@ -755,10 +941,9 @@ class Sentinel(models.Model):
             CoolDown.objects.filter(profile=profile, type=cooldown_type).delete()
             return self.delete()
 
-    def logs_message(self, embed, profile: Profile) -> List[RCDMessage]:
+    def logs_message(self, items: Dict[str, int], profile: Profile) -> List[RCDMessage]:
         area, snoop = defaults_from(self.metadata, {"area": 5, "snoop": None})
-        future_logs, future_available = inventory.calculate_log_future(area, *(field.value for field in embed.fields))
-        self.delete()
+        future_logs, future_available = inventory.calculate_log_future(area, items)
         if not future_available:
             return [ErrorMessage(f"<@!{profile.uid}> Sorry, log futures are broken.")]
         results = []
@@ -774,16 +959,13 @@ class Sentinel(models.Model):
         )
         return results
 
-    def can_craft_message(self, embed, profile: Profile) -> List[RCDMessage]:
+    def can_craft_message(self, items: Dict[str, int], profile: Profile) -> List[RCDMessage]:
         area, snoop, recipe, recipe_name = defaults_from(
             self.metadata, {"area": 5, "snoop": None, "recipe": None, "name": None}
         )
-        self.delete()
         if not recipe or not recipe_name:
             return [ErrorMessage(f"<@!{profile.uid}> Sorry, I don't know what the recipe was supposed to be.")]
-        can_craft, future_available = inventory.can_craft(
-            area, Inventory(**recipe), *(field.value for field in embed.fields)
-        )
+        can_craft, future_available = inventory.can_craft(area, Inventory(**recipe), items)
         if not future_available:
             return [ErrorMessage(f"<@!{profile.uid}> Sorry, the craft feature is broken.")]
         results = []
@@ -799,18 +981,16 @@ class Sentinel(models.Model):
         results.append(message)
         return results
 
-    def how_many_message(self, embed, profile: Profile) -> List[RCDMessage]:
+    def how_many_message(self, items: Dict[str, int], profile: Profile) -> List[RCDMessage]:
         area, snoop, recipe, recipe_name = defaults_from(
             self.metadata, {"area": 5, "snoop": None, "recipe": None, "name": None}
         )
-        self.delete()
         if not recipe or not recipe_name:
             return [ErrorMessage(f"<@!{profile.uid}> Sorry, I don't know what the recipe was supposed to be.")]
-        how_many, total_recipe = inventory.how_many(area, Inventory(**recipe), *(field.value for field in embed.fields))
+        how_many, total_recipe = inventory.how_many(area, Inventory(**recipe), items)
         if not total_recipe:
             return [ErrorMessage(f"<@!{profile.uid}> Sorry, the howmany feature is broken.")]
-        _total_recipe = Inventory()
-        _total_recipe.inventory = total_recipe
+        _total_recipe = Inventory.from_vector(total_recipe)
         results, title, recipe_name = [], f"How Many (Area {area})", recipe_name.replace("_", " ")
         if snoop:
             results.append(f"<@!{snoop}> Psssstt... **{profile.last_known_nickname}** opened their inventory!\n")
@@ -822,6 +1002,30 @@ class Sentinel(models.Model):
         results.append(message)
         return results
 
+    def craftable_message(self, items: Dict[str, int], profile: Profile) -> List[RCDMessage]:
+        area, snoop = defaults_from(self.metadata, {"area": 5, "snoop": None})
+        counts, future_available = inventory.craftable(area, items)
+        if not future_available:
+            return [ErrorMessage(f"<@!{profile.uid}> Sorry, the craft feature is broken.")]
+        results, title = [], f"Craftable (Area {area})"
+        if snoop:
+            results.append(f"<@!{snoop}> Psssstt... **{profile.last_known_nickname}** opened their inventory!")
+        # recipes past the time budget are left out, say how many
+        skipped = sum(count is None for count in counts.values())
+        note = f"\n_Ran out of time, {skipped} of {len(counts)} recipes weren't checked._" if skipped else ""
+        counts = {name.replace("_", " "): count for name, count in counts.items() if count}
+        if not counts:
+            results.append(
+                NormalMessage(f"<@!{profile.uid}> It looks like you can't craft anything yet.{note}", title=title)
+            )
+            return results
+        width = max(map(len, counts))
+        table = "\n".join(f"{name:>{width}}: {count:,}" for name, count in counts.items())
+        results.append(
+            SuccessMessage(f"<@!{profile.uid}> Here's what you can craft:\n```{table}```{note}", title=title)
+        )
+        return results
+
 
 class Area(models.Model):
     class Meta:
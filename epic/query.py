@@ -2,26 +2,64 @@ import datetime
 
 from asgiref.sync import sync_to_async
 
-from django.db.models import Q
-from django.db import transaction
+from django.db.models import Q, Case, When, Value, CharField
+from django.db import transaction, connection
 
+from .cache import TTLCache, MISSING
 from .models import CoolDown, Profile, Guild, Hunt
+from .reminders import scheduler
 from .types.classes import Enum
 
 
+def _supports_upsert():
+    if connection.vendor == "postgresql":
+        return True
+    # sqlite added INSERT ... ON CONFLICT in 3.24
+    return connection.vendor == "sqlite" and connection.Database.sqlite_version_info >= (3, 24, 0)
+
+
+@transaction.atomic
+def _bulk_upsert_cooldowns(cooldowns, batch_size=300):
+    # relies on the (profile, type) uniqueness of CoolDown to turn conflicts into updates
+    qn = connection.ops.quote_name
+    fields = [CoolDown._meta.get_field(name) for name in ("profile", "type", "after")]
+    profile_col, type_col, after_col = (qn(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        for i in range(0, len(cooldowns), batch_size):
+            batch = cooldowns[i : i + batch_size]
+            values = ", ".join(["(%s, %s, %s)"] * len(batch))
+            params = [
+                field.get_db_prep_save(getattr(cooldown, field.attname), connection)
+                for cooldown in batch
+                for field in fields
+            ]
+            cursor.execute(
+                f"INSERT INTO {qn(CoolDown._meta.db_table)} ({profile_col}, {type_col}, {after_col}) "
+                f"VALUES {values} "
+                f"ON CONFLICT ({profile_col}, {type_col}) DO UPDATE SET {after_col} = excluded.{after_col}",
+                params,
+            )
+
+
 def _upsert_cooldowns(cooldowns):
-    q = Q(id=-1)
     cooldown_dict = {}
-    # search for existing and update if they already exist
     for cooldown in cooldowns:
         cooldown_dict[(cooldown.profile_id, cooldown.type)] = cooldown
-        q |= Q(profile_id=cooldown.profile_id) & Q(type=cooldown.type)
-    for cooldown in CoolDown.objects.filter(q):
-        cooldown.after = cooldown_dict.pop((cooldown.profile_id, cooldown.type)).after
-        cooldown.save()
-    # save left over as new
-    for cooldown in cooldown_dict.values():
-        cooldown.save()
+    if _supports_upsert():
+        _bulk_upsert_cooldowns(list(cooldown_dict.values()))
+    else:
+        # search for existing and update if they already exist
+        q = Q(id=-1)
+        for profile_id, cd_type in cooldown_dict:
+            q |= Q(profile_id=profile_id) & Q(type=cd_type)
+        pending = cooldown_dict.copy()
+        for cooldown in CoolDown.objects.filter(q):
+            cooldown.after = pending.pop((cooldown.profile_id, cooldown.type)).after
+            cooldown.save()
+        # save left over as new
+        for cooldown in pending.values():
+            cooldown.save()
+    scheduler.schedule_cooldowns(cooldown_dict.values())
 
 
 upsert_cooldowns = sync_to_async(_upsert_cooldowns)
@@ -80,16 +118,12 @@ def get_cooldown_messages():
     flavor_map = CoolDown.COOLDOWN_TEXT_MAP
     messages, cleanup = [], []
     # get cooldowns minus special cases
-
-    for cd_type in set(c[0] for c in CoolDown.COOLDOWN_TYPE_CHOICES) - {"guild"}:
-        for _id, channel, uid in (
-            Profile.objects.command_type_enabled(cd_type)
-            .filter(cooldown__after__lte=now, cooldown__type=cd_type)
-            .exclude(banned=True)
-            .values_list("cooldown__id", "channel", "uid")
-        ):
-            messages.append((f"<@{uid}> {flavor_map[cd_type]} (**{cd_type.title()}**)", channel))
-            cleanup.append(_id)
+    cooldown_types = [c[0] for c in CoolDown.COOLDOWN_TYPE_CHOICES if c[0] != "guild"]
+    for _id, cd_type, channel, uid in CoolDown.objects.due(now, cooldown_types).values_list(
+        "id", "type", "profile__channel", "profile_id"
+    ):
+        messages.append((f"<@{uid}> {flavor_map[cd_type]} (**{cd_type.title()}**)", channel))
+        cleanup.append(_id)
     CoolDown.objects.filter(id__in=cleanup).delete()
     cleanup.clear()
     return messages
@@ -126,12 +160,52 @@ def set_guild_cd(profile, after=None):
         return
     raid_dibbs_id = None if guild.raid_dibbs_id == profile.uid else guild.raid_dibbs_id
     Guild.objects.filter(profile__uid=profile.uid).update(after=after, raid_dibbs_id=raid_dibbs_id)
+    scheduler.schedule_guild(guild.name, after)
+
+
+@sync_to_async
+def load_reminders():
+    for profile_id, cd_type, after in CoolDown.objects.values_list("profile_id", "type", "after"):
+        scheduler.schedule_cooldown(profile_id, cd_type, after)
+    for name, after in Guild.objects.filter(after__isnull=False).values_list("name", "after"):
+        scheduler.schedule_guild(name, after)
+
+
+# guild lists are paged through in bursts, so remember what was last written:
+# the guilds which exist and the guild each player was last put in
+_known_guilds = TTLCache(maxsize=1024, ttl=600)
+_known_player_guild = TTLCache(maxsize=8192, ttl=600)
 
 
 def _set_guild_membership(guild_membership_dict):
+    # guild name -> member ids whose guild has to be written
+    changed = {}
     for guild_name, member_id_list in guild_membership_dict.items():
-        guild, _ = Guild.objects.get_or_create(name=guild_name)
-        Profile.objects.filter(uid__in=member_id_list).update(player_guild=guild)
+        moved = frozenset(str(uid) for uid in member_id_list if _known_player_guild.get(str(uid)) != guild_name)
+        if moved or _known_guilds.get(guild_name) is MISSING:
+            changed[guild_name] = moved
+    if not changed:
+        return
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    all_member_ids = frozenset().union(*changed.values())
+    with transaction.atomic():
+        Guild.objects.bulk_create(
+            [Guild(name=guild_name, created=now, updated=now) for guild_name in changed], ignore_conflicts=True
+        )
+        if all_member_ids:
+            # the first matching When wins, reverse so later guilds win like they would with one update per guild
+            membership_case = Case(
+                *(When(uid__in=ids, then=Value(name)) for name, ids in reversed(list(changed.items())) if ids),
+                output_field=CharField(),
+            )
+            Profile.objects.filter(uid__in=all_member_ids).update(player_guild=membership_case)
+    # in order, so a player listed in several guilds ends up in the last one here too
+    for guild_name, member_ids in changed.items():
+        _known_guilds.set_on_commit(guild_name, True)
+        for uid in member_ids:
+            _known_player_guild.set_on_commit(uid, guild_name)
+    for uid in all_member_ids:
+        Profile.cache.invalidate(uid)
 
 
 set_guild_membership = sync_to_async(_set_guild_membership)
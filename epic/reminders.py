@@ -0,0 +1,173 @@
+import time
+import heapq
+import asyncio
+import logging
+import datetime
+import threading
+
+from collections import OrderedDict, defaultdict
+from typing import Optional, Hashable, Iterable, List, Tuple, Dict
+
+logger = logging.getLogger(__name__)
+
+# discord rejects messages longer than this
+MESSAGE_LENGTH_LIMIT = 2000
+
+
+class ReminderScheduler:
+    """
+    In-memory priority queue of upcoming reminders so the notify loop can sleep
+    until something is actually due instead of polling the database.
+
+    Keys are ``("cooldown", profile_id, type)`` or ``("guild", name)``; rescheduling
+    a key replaces its due time. Stale heap entries are skipped when popped, and the
+    heap is rebuilt once they outnumber the live ones.
+
+    Only writes made in this process are scheduled. Cooldowns written by another process
+    (e.g. the admin or a history import) are picked up by the sweep which runs at least
+    every ``max_sleep`` seconds, so their reminders can be up to that late.
+    """
+
+    # upper bound on a single sleep so reminders written by another process are still swept
+    max_sleep = 60
+
+    def __init__(self):
+        self._heap = []
+        self._due = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+        self._sleeping_until = None
+
+    def schedule(self, key: Hashable, after: Optional[datetime.datetime]):
+        if after is None:
+            return
+        when = after.timestamp()
+        with self._lock:
+            if self._due.get(key) == when:
+                return
+            self._due[key] = when
+            heapq.heappush(self._heap, (when, key))
+            if len(self._heap) > 2 * len(self._due):
+                self._compact()
+            # writes come from sync_to_async worker threads, so the sleeping loop is woken thread-safely
+            if self._sleeping_until is not None and when < self._sleeping_until:
+                self._sleeping_until = when
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def schedule_cooldown(self, profile_id, cooldown_type: str, after: Optional[datetime.datetime]):
+        self.schedule(("cooldown", str(profile_id), cooldown_type), after)
+
+    def schedule_cooldowns(self, cooldowns: Iterable):
+        for cooldown in cooldowns:
+            self.schedule_cooldown(cooldown.profile_id, cooldown.type, cooldown.after)
+
+    def schedule_guild(self, guild_name: str, after: Optional[datetime.datetime]):
+        self.schedule(("guild", guild_name), after)
+
+    def retry_in(self, seconds: float):
+        self.schedule(("retry",), datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(seconds=seconds))
+
+    def _compact(self):
+        self._heap = [(when, key) for key, when in self._due.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float) -> List[Hashable]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, key = heapq.heappop(self._heap)
+            if self._due.get(key) == when:
+                del self._due[key]
+                due.append(key)
+        return due
+
+    def __len__(self):
+        return len(self._due)
+
+    async def wait(self) -> List[Hashable]:
+        """
+        Sleep until at least one reminder is due and return the keys that came due.
+        Returns an empty list if nothing came due within ``max_sleep`` seconds.
+        """
+        if self._loop is None:
+            self._loop, self._wakeup = asyncio.get_event_loop(), asyncio.Event()
+        deadline = time.time() + self.max_sleep
+        while True:
+            with self._lock:
+                now = time.time()
+                due = self._pop_due(now)
+                if due or now >= deadline:
+                    return due
+                wake_at = min(self._heap[0][0], deadline) if self._heap else deadline
+                timeout = wake_at - now
+                self._sleeping_until = wake_at
+                self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    self._sleeping_until = None
+
+
+scheduler = ReminderScheduler()
+
+
+def batch_messages(messages: Iterable[Tuple[str, int]], limit=MESSAGE_LENGTH_LIMIT) -> Dict[int, List[str]]:
+    """
+    Group reminders by channel, joining them into as few messages as fit within ``limit``.
+    """
+    batches = defaultdict(list)
+    for message, channel in messages:
+        batch = batches[channel]
+        if batch and len(batch[-1]) + len(message) + 1 <= limit:
+            batch[-1] = f"{batch[-1]}\n{message}"
+        else:
+            batch.append(message)
+    return batches
+
+
+class ReminderDelivery:
+    """
+    Sends reminders to their channels, resolving channels from the gateway cache
+    when possible and keeping an LRU of channels that had to be fetched over HTTP.
+    """
+
+    def __init__(self, client, max_concurrency=5, max_channels=1024):
+        self.client = client
+        self.max_channels = max_channels
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._fetched = OrderedDict()
+
+    async def get_channel(self, channel_id: int):
+        channel = self.client.get_channel(channel_id)
+        if channel is not None:
+            return channel
+        channel = self._fetched.get(channel_id)
+        if channel is not None:
+            self._fetched.move_to_end(channel_id)
+            return channel
+        channel = await self.client.fetch_channel(channel_id)
+        self._fetched[channel_id] = channel
+        if len(self._fetched) > self.max_channels:
+            self._fetched.popitem(last=False)
+        return channel
+
+    async def _send(self, channel_id: int, contents: List[str]):
+        # bounds how many channels are written to at once; discord.py handles per route rate limits
+        async with self._semaphore:
+            channel = await self.get_channel(channel_id)
+            for content in contents:
+                await channel.send(content)
+
+    async def send(self, messages: Iterable[Tuple[str, int]]):
+        batches = batch_messages(messages)
+        results = await asyncio.gather(
+            *(self._send(channel_id, contents) for channel_id, contents in batches.items()),
+            return_exceptions=True,
+        )
+        for channel_id, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                self._fetched.pop(channel_id, None)
+                logger.error("could not send reminder message to %s", channel_id, exc_info=result)
@@ -0,0 +1,113 @@
+import time
+import datetime
+from unittest import mock
+
+from django.test import TransactionTestCase, SimpleTestCase
+
+from epic.cache import TTLCache, MISSING
+from epic.models import Server, Profile, CoolDown, Event
+
+
+class TestTTLCache(SimpleTestCase):
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1), cache.set("b", None)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        # "b" was the least recently used
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_expiry(self):
+        cache = TTLCache(ttl=10)
+        with mock.patch("epic.cache.time.monotonic", return_value=100):
+            cache.set("a", 1)
+        with mock.patch("epic.cache.time.monotonic", return_value=109):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("epic.cache.time.monotonic", return_value=111):
+            self.assertIs(cache.get("a"), MISSING)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestServerCache(TransactionTestCase):
+    def setUp(self):
+        Server.cache.clear()
+
+    def test_unregistered_guild_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(Server.from_guild_id(1))
+            self.assertIsNone(Server.from_guild_id(1))
+        Server.objects.create(id=1, name="Test Server")
+        with self.assertNumQueries(0):
+            self.assertEqual(Server.from_guild_id(1).name, "Test Server")
+
+    def test_saving_server_refreshes_cache(self):
+        server = Server.objects.create(id=1, name="Test Server")
+        server.active = False
+        server.save()
+        with self.assertNumQueries(0):
+            self.assertFalse(Server.from_guild_id(1).active)
+        server.delete()
+        self.assertIsNone(Server.from_guild_id(1))
+
+    def test_callers_get_their_own_copy(self):
+        server = Server.objects.create(id=1, name="Test Server")
+        cached = Server.from_guild_id(1)
+        self.assertIsNot(cached, server)
+        cached.active = False
+        self.assertTrue(Server.from_guild_id(1).active)
+        Server.cache.clear()
+        Server.from_guild_id(1).name = "Renamed"
+        self.assertEqual(Server.from_guild_id(1).name, "Test Server")
+
+
+class TestProfileCache(TransactionTestCase):
+    def setUp(self):
+        Profile.cache.clear()
+        self.server = Server.objects.create(id=1, name="Test Server")
+        self.defaults = {"last_known_nickname": "JP", "server": self.server, "channel": 10}
+
+    def test_get_or_create_cached(self):
+        profile, created = Profile.get_or_create_cached(1, defaults=self.defaults)
+        self.assertTrue(created)
+        with self.assertNumQueries(0):
+            cached, created = Profile.get_or_create_cached(1, defaults=self.defaults)
+        self.assertFalse(created)
+        self.assertEqual(cached, profile)
+        # callers get their own copy
+        self.assertIsNot(cached, Profile.get_or_create_cached(1)[0])
+
+    def test_write_through(self):
+        profile, _ = Profile.get_or_create_cached("1", defaults=self.defaults)
+        profile.update(notify=True)
+        with self.assertNumQueries(0):
+            self.assertTrue(Profile.get_or_create_cached("1")[0].notify)
+        profile.delete()
+        self.assertTrue(Profile.get_or_create_cached("1", defaults=self.defaults)[1])
+
+
+class TestEventCooldownCache(TransactionTestCase):
+    def setUp(self):
+        CoolDown.event_cooldown_cache.clear()
+        self.now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    def test_cached_until_event_changes(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(CoolDown.get_cooldown("hunt"), CoolDown.COOLDOWN_MAP["hunt"])
+            self.assertEqual(CoolDown.get_event_cooldown_map()[1], [])
+        event = Event.objects.create(
+            event_name="Hunt Party", cooldown_adjustments={"hunt": 30}, end=self.now + datetime.timedelta(days=1)
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(CoolDown.get_cooldown("hunt"), datetime.timedelta(seconds=30))
+            self.assertEqual(CoolDown.get_event_cooldown_map()[1], ["Hunt Party"])
+        event.delete()
+        self.assertEqual(CoolDown.get_cooldown("hunt"), CoolDown.COOLDOWN_MAP["hunt"])
+
+    def test_expires_at_next_event_boundary(self):
+        Event.objects.create(event_name="Soon", cooldown_adjustments={}, end=self.now + datetime.timedelta(days=1))
+        Event.objects.filter(event_name="Soon").update(start=self.now + datetime.timedelta(minutes=5))
+        CoolDown.event_cooldown_cache.clear()
+        self.assertEqual(CoolDown.get_event_cooldown_map()[1], [])
+        expires, _ = CoolDown.event_cooldown_cache._data["map"]
+        self.assertAlmostEqual(expires - time.monotonic(), 300, delta=5)
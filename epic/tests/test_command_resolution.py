@@ -0,0 +1,128 @@
+import re
+import json
+import itertools
+from pathlib import Path
+
+from django.test import TestCase
+
+from epic.models import CoolDown
+from epic.utils import tokenize
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures"
+
+# COMMAND_RESOLUTION_MAP as it was before it got compiled into COMMAND_RESOLUTION_TABLE
+LEGACY_COMMAND_RESOLUTION_MAP = {
+    "daily": lambda x: "daily",
+    "weekly": lambda x: "weekly",
+    "buy": lambda x: "lootbox" if "lootbox" in x else None,
+    "vote": lambda x: "vote",
+    "hunt": lambda x: "hunt",
+    "adv": lambda x: "adventure",
+    "adventure": lambda x: "adventure",
+    "farm": lambda x: "farm",
+    "quest": lambda x: "quest",
+    "epic": lambda x: "quest" if "quest" in x else None,
+    "tr": lambda x: "training",
+    "training": lambda x: "training",
+    "ultr": lambda x: "training",
+    "ultraining": lambda x: "training",
+    "duel": lambda x: "duel",
+    "mine": lambda x: "work",
+    "pickaxe": lambda x: "work",
+    "drill": lambda x: "work",
+    "dynamite": lambda x: "work",
+    "pickup": lambda x: "work",
+    "ladder": lambda x: "work",
+    "tractor": lambda x: "work",
+    "greenhouse": lambda x: "work",
+    "chop": lambda x: "work",
+    "axe": lambda x: "work",
+    "bowsaw": lambda x: "work",
+    "chainsaw": lambda x: "work",
+    "fish": lambda x: "work",
+    "net": lambda x: "work",
+    "boat": lambda x: "work",
+    "bigboat": lambda x: "work",
+    "horse": lambda x: "horse" if any([o in x for o in ["breed", "breeding", "race"]]) else None,
+    "arena": lambda x: "arena",
+    "big": lambda x: "arena" if "arena join" in x else None,
+    "dung": lambda x: "dungeon",
+    "dungeon": lambda x: "dungeon",
+    "miniboss": lambda x: "dungeon",
+    "not": lambda x: "dungeon" if "so mini boss join" in x else None,
+    "guild": lambda x: "guild" if any([o in x for o in ("raid", "upgrade")]) else None,
+    "pet": lambda x: "pet" if re.match(r"(adv|adventure) (find|learn|drill) [a-z]{1,2}", x) else None,
+    "pets": lambda x: "pet" if re.match(r"(adv|adventure) (find|learn|drill) [a-z]{1,2}", x) else None,
+}
+
+
+def legacy_default_cmd_cd(cmd):
+    tokens = tokenize(cmd)
+    if not tokens:
+        return None, None, []
+    if len(tokens) == 1:
+        resolved = LEGACY_COMMAND_RESOLUTION_MAP.get(tokens[0], lambda x: None)("")
+    else:
+        cmd, *args = tokens
+        if cmd == "ascended":
+            cmd, *args = args
+            tokens = [cmd, *args]
+        resolved = LEGACY_COMMAND_RESOLUTION_MAP.get(cmd, lambda x: None)(" ".join(args))
+    if not resolved:
+        return None, None, tokens
+    return resolved, CoolDown.get_cooldown(resolved), tokens
+
+
+def fixture_commands():
+    def walk(obj):
+        if isinstance(obj, dict):
+            content = obj.get("content")
+            if isinstance(content, str) and content.lower().startswith("rpg"):
+                yield content
+            for value in obj.values():
+                yield from walk(value)
+
+    for path in sorted(FIXTURE_PATH.glob("**/*.json")):
+        with open(path, "r") as r:
+            yield from walk(json.load(r))
+
+
+class TestCommandResolution(TestCase):
+    arguments = [
+        "",
+        "lootbox",
+        "epic lootbox",
+        "quest",
+        "breed <@!2>",
+        "breeding <@!2>",
+        "race",
+        "arena join",
+        "so mini boss join",
+        "raid",
+        "upgrade",
+        "adv find a",
+        "adventure learn bc",
+        "adv drill",
+        "info",
+        "<@!1> <@!2>",
+    ]
+
+    def corpus(self):
+        commands = [*LEGACY_COMMAND_RESOLUTION_MAP, "ascended", "inventory", "cd", ""]
+        for command, arguments in itertools.product(commands, self.arguments):
+            yield f"rpg {command} {arguments}"
+            yield f"rpg ascended {command} {arguments}"
+        yield from fixture_commands()
+
+    def test_matches_legacy_resolution(self):
+        corpus = list(self.corpus())
+        self.assertTrue(any("not so mini boss" in command for command in corpus))
+        for command in corpus:
+            content = command.lower()[3:]
+            self.assertEqual(CoolDown.default_cmd_cd(content), legacy_default_cmd_cd(content), command)
+            # handlers hand over tokens they already have
+            tokens = tokenize(command)[1:]
+            self.assertEqual(CoolDown.default_cmd_cd(content, tokens), legacy_default_cmd_cd(content), command)
+
+    def test_every_command_resolves(self):
+        self.assertEqual(set(CoolDown.COMMAND_RESOLUTION_TABLE), set(LEGACY_COMMAND_RESOLUTION_MAP))
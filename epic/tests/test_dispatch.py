@@ -0,0 +1,111 @@
+import time
+
+from django.test import TestCase
+
+from epic.cmd import handle_rcd_command, dispatch_rcd_command
+from epic.models import Server, Profile, Sentinel
+from epic.tests.util import FakeClient, benchmark, report
+from epic.types import Namespace
+from epic.types.classes import RCDMessage
+from epic.utils import tokenize
+
+COMMANDS = [
+    "rcd",
+    "rrd",
+    "rcd cd",
+    "rcd rd hunt",
+    "rcd help",
+    "rcd h logs",
+    "rcd h craftable",
+    "rcd h stats gambling",
+    "rcd help admin",
+    "rcd info",
+    "rcd i 1",
+    "rcd i 2",
+    "rcd p",
+    "rcd p tz",
+    "rcd tz",
+    "rcd tf",
+    "rcd mp",
+    "rcd notify",
+    "rcd hunt off",
+    "rcd notify all on",
+    "rcd on",
+    "rcd s",
+    "rcd s g",
+    "rcd checklist",
+    "rcd cl a3",
+    "rcd logs a7",
+    "rcd cr a10",
+    "rcd craftable a16",
+    "rcd dibbs?",
+    "rcd register asdf",
+    "rcd admin",
+    "rcd event show xmas",
+    "rcd ban",
+    "rcd not a command",
+]
+
+
+class TestDispatch(TestCase):
+    def setUp(self):
+        self.server = Server.objects.create(id=1, name="Test Server")
+        self.profile = Profile.objects.create(uid="1", server=self.server, channel=2, last_known_nickname="JP")
+        self.client = FakeClient({1: {"name": "JP"}})
+
+    def message(self, content):
+        return Namespace.from_collection(
+            {
+                "content": content,
+                "author": {"id": 1, "name": "JP"},
+                "channel": {"id": 2, "name": "general", "guild": {"id": 1, "name": "Test Server"}},
+            }
+        )
+
+    def run_command(self, handle, content, profile=None):
+        tokens = tokenize(content)[1:] or ["cd"]
+        return handle(self.client, tokens, self.message(content), self.server, profile, None)
+
+    @staticmethod
+    def comparable(result):
+        messages, (coro, args) = result
+        return (
+            [m.to_embed().to_dict() if isinstance(m, RCDMessage) else m for m in messages],
+            coro and coro.__name__,
+        )
+
+    def test_dispatch_matches_pipeline(self):
+        for content in COMMANDS:
+            with self.subTest(content=content):
+                self.assertEqual(
+                    self.comparable(self.run_command(handle_rcd_command, content)),
+                    self.comparable(self.run_command(dispatch_rcd_command, content)),
+                )
+
+    def test_banned_profile(self):
+        self.profile.update(banned=True)
+        for content in ["rcd not a command", "rcd cd", "rcd help"]:
+            with self.subTest(content=content):
+                self.assertEqual(
+                    self.comparable(self.run_command(handle_rcd_command, content)),
+                    self.comparable(self.run_command(dispatch_rcd_command, content)),
+                )
+
+    def test_craftable_sentinel(self):
+        self.run_command(dispatch_rcd_command, "rcd cr a10", self.profile)
+        self.run_command(dispatch_rcd_command, "rcd craftable a11", self.profile)
+        sentinel = Sentinel.objects.get(profile=self.profile, action="craftable")
+        self.assertEqual(sentinel.metadata, {"area": 11})
+        self.assertFalse(Sentinel.objects.filter(action="logs").exists())
+
+    @benchmark
+    def test_dispatch_benchmark(self):
+        # commands which do not touch the database, so only the cost of dispatching is measured
+        commands, rounds, timings = ["rcd h admin", "rcd i 1", "rcd mp", "rcd not a command"], 50, {}
+        for handle in (handle_rcd_command, dispatch_rcd_command):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for content in commands:
+                    self.run_command(handle, content, self.profile)
+            timings[handle.__name__] = (time.perf_counter() - start) / (rounds * len(commands))
+        report("command", timings)
@@ -0,0 +1,81 @@
+import re
+import random
+import itertools
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from epic import inventory
+from epic.inventory import parse_inventory, inventory_items, _parse_inventory
+
+# parse_inventory's patterns before they were combined into inventory_regex
+legacy_patterns = [re.compile(rf"\*\*{re.escape(name)}\*\*: (?P<{item}>\d+)") for name, item in inventory_items.items()]
+
+
+def legacy_parse_inventory(*values):
+    inventory = {}
+    full_string = "\n".join(values)
+    for pattern in legacy_patterns:
+        match = pattern.search(full_string)
+        if match:
+            inventory.update(match.groupdict())
+    return {name: int(qty) for name, qty in inventory.items()}
+
+
+def inventory_embed(seed):
+    rand = random.Random(seed)
+    emoji = "<:item:697940429999439872>"
+    names = [*inventory_items, "ruby", "life potion", "seed", "lottery ticket", "OMEGA horse token"]
+    rand.shuffle(names)
+    lines = [f"{emoji} **{name}**: {rand.randint(0, 10 ** rand.randint(1, 9))}" for name in names]
+    return "\n".join(lines[: len(lines) // 2]), "\n".join(lines[len(lines) // 2 :])
+
+
+class TestParseInventory(SimpleTestCase):
+    def test_matches_legacy_patterns(self):
+        for seed in range(200):
+            values = inventory_embed(seed)
+            self.assertEqual(parse_inventory(*values), legacy_parse_inventory(*values))
+
+    def test_matches_legacy_patterns_on_noise(self):
+        rand = random.Random(0)
+        fragments = ["**", "*", ": ", "1", "23", " ", "\n", "apple", "EPIC", " log", "ruby", "banana"]
+        for _ in range(5000):
+            value = "".join(rand.choice(fragments) for _ in range(rand.randint(0, 20)))
+            self.assertEqual(parse_inventory(value), legacy_parse_inventory(value), value)
+
+    def test_first_mention_counts(self):
+        values = ("**apple**: 5\n**EPIC log**: 3", "**apple**: 7\n**wooden log**: 1")
+        self.assertEqual(parse_inventory(*values), {"apple": 5, "epic_log": 3, "wooden_log": 1})
+        self.assertEqual(parse_inventory(*values), legacy_parse_inventory(*values))
+
+    def test_uncached_parse_matches_legacy(self):
+        for seed in range(200, 500):
+            values = inventory_embed(seed)
+            self.assertEqual(dict(_parse_inventory.__wrapped__("\n".join(values))), legacy_parse_inventory(*values))
+
+
+class TestCraftable(SimpleTestCase):
+    def craftable(self, ticks):
+        # every look at the clock moves it forward by a tick, so the budget runs out after a known number of batches
+        clock = itertools.count(step=ticks)
+        with mock.patch.object(inventory.time, "monotonic", side_effect=lambda: next(clock)):
+            with mock.patch.object(
+                inventory.crafting, "how_many_batch", side_effect=lambda recipes, _: [(1, None)] * len(recipes)
+            ) as how_many_batch:
+                counts, available = inventory.craftable(10, {"apple": 5})
+        self.assertTrue(available)
+        return counts, how_many_batch.call_count
+
+    def test_within_budget(self):
+        counts, calls = self.craftable(0)
+        self.assertTrue(counts and all(count == 1 for count in counts.values()))
+        self.assertEqual(calls, -(-len(counts) // inventory.CRAFTABLE_BATCH))
+
+    def test_out_of_time(self):
+        # deadline at 1.0, checks at 0.3, 0.6 and 0.9 start a batch, the one at 1.2 stops
+        counts, calls = self.craftable(0.3)
+        self.assertEqual(calls, 3)
+        evaluated = [name for name, count in counts.items() if count is not None]
+        self.assertEqual(evaluated, list(counts)[: 3 * inventory.CRAFTABLE_BATCH])
+        self.assertGreater(len(counts), len(evaluated))
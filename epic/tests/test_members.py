@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase
+
+from epic.members import MemberIndex
+from epic.types import Namespace
+
+
+def member(user_id, name, discriminator="0001"):
+    return Namespace(id=user_id, name=name, discriminator=discriminator)
+
+
+class TestMemberIndex(SimpleTestCase):
+    def test_shared_members_and_removal(self):
+        index = MemberIndex()
+        # JP shares two guilds with the client
+        index.rebuild([member(1, "JP"), member(2, "JP"), member(1, "JP"), member(3, "Someone")])
+        self.assertEqual(sorted(index.ids_for_name("JP")), ["1", "2"])
+        index.remove(member(1, "JP"))
+        self.assertEqual(sorted(index.ids_for_name("JP")), ["1", "2"])
+        index.remove_all([member(1, "JP"), member(2, "JP")])
+        self.assertEqual(index.ids_for_name("JP"), [])
+        self.assertEqual(index.ids_for_name("Nobody"), [])
+
+    def test_rename(self):
+        index = MemberIndex()
+        index.add_all([member(1, "JP"), member(1, "JP")])
+        index.rename(member(1, "JP"), member(1, "PJ"))
+        self.assertEqual((index.ids_for_name("JP"), index.ids_for_name("PJ")), ([], ["1"]))
+        # the rename was already applied for the other guild
+        index.rename(member(1, "JP"), member(1, "PJ"))
+        index.remove(member(1, "PJ"))
+        self.assertEqual(index.ids_for_name("PJ"), ["1"])
+
+    def test_tags(self):
+        index = MemberIndex()
+        index.rebuild([member(1, "JP", "7416"), member(2, "JP", "1234"), member(1, "JP", "7416")])
+        self.assertEqual((index.id_for_tag("JP", "7416"), index.id_for_tag("JP", "1234")), (1, 2))
+        index.remove(member(1, "JP", "7416"))
+        self.assertEqual(index.id_for_tag("JP", "7416"), 1)
+        index.rename(member(1, "JP", "7416"), member(1, "JP", "0007"))
+        self.assertEqual((index.id_for_tag("JP", "7416"), index.id_for_tag("JP", "0007")), (None, 1))
+        index.remove(member(2, "JP", "1234"))
+        self.assertIsNone(index.id_for_tag("JP", "1234"))
+
+    def test_discriminator_change_in_shared_guilds(self):
+        index = MemberIndex()
+        index.add_all([member(1, "JP", "7416"), member(1, "JP", "7416")])
+        index.rename(member(1, "JP", "7416"), member(1, "JP", "0007"))
+        self.assertEqual((index.id_for_tag("JP", "7416"), index.id_for_tag("JP", "0007")), (None, 1))
+        index.remove_all([member(1, "JP", "0007"), member(1, "JP", "0007")])
+        self.assertEqual((index.id_for_tag("JP", "0007"), index.ids_for_name("JP")), (None, []))
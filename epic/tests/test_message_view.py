@@ -0,0 +1,116 @@
+import time
+from types import SimpleNamespace
+
+import discord
+from django.test import SimpleTestCase
+
+from epic.tests.util import benchmark, report
+from epic.types.classes import Namespace, MessageView, EMPTY
+
+
+def message_data():
+    return {
+        "content": "",
+        "author": {"id": 555955826880413696, "name": "EPIC RPG", "discriminator": "4117"},
+        "channel": {"id": 10, "guild": {"id": 1, "name": "Test Server"}},
+        "embeds": [
+            {
+                "title": None,
+                "description": "**JP** fights the **arena**",
+                "author": {"name": "JP's cooldowns", "icon_url": "https://cdn.discordapp.com/avatars/1/a.png"},
+                "fields": [{"name": "Rewards", "value": "`daily`"}, {"name": "Experience", "value": "`hunt`"}],
+            }
+        ],
+    }
+
+
+def live_message():
+    embed = discord.Embed(description="**JP** fights the **arena**")
+    embed.set_author(name="JP's cooldowns", icon_url="https://cdn.discordapp.com/avatars/1/a.png")
+    embed.add_field(name="Rewards", value="`daily`").add_field(name="Experience", value="`hunt`")
+    return SimpleNamespace(
+        content="",
+        author=SimpleNamespace(id=555955826880413696, name="EPIC RPG", discriminator="4117"),
+        channel=SimpleNamespace(id=10, guild=SimpleNamespace(id=1, name="Test Server")),
+        embeds=[embed],
+    )
+
+
+def plain_message():
+    # same message without discord.Embed's own property overhead, to compare the wrappers alone
+    def to_objects(obj):
+        if isinstance(obj, dict):
+            return SimpleNamespace(**{key: to_objects(value) for key, value in obj.items()})
+        if isinstance(obj, list):
+            return [to_objects(value) for value in obj]
+        return obj
+
+    return to_objects(message_data())
+
+
+def touch(message):
+    # roughly what a handler looks at for a single message
+    embed = message.embeds[0]
+    for cue in ("cooldowns", "ready", "cooldown", "'s pets", "'s inventory", "blackjack", "coinflip", "arena"):
+        if cue in embed.author.name:
+            break
+    return (
+        f"{message.author.name}#{message.author.discriminator}",
+        message.channel.id,
+        message.channel.guild.id,
+        str(embed.title),
+        embed.author.name,
+        embed.author.icon_url,
+        [field.value for field in embed.fields],
+        str(embed.footer.text),
+        bool(message.reference.message_id),
+    )
+
+
+class TestMessageView(SimpleTestCase):
+    def test_matches_namespace(self):
+        expected = touch(Namespace.from_collection(message_data()))
+        self.assertEqual(touch(MessageView(live_message())), expected)
+        self.assertEqual(touch(MessageView(plain_message())), expected)
+
+    def test_null_safety(self):
+        view = MessageView(live_message())
+        embed = view.embeds[0]
+        self.assertIs(embed.title, EMPTY)
+        self.assertIs(view.reference.resolved.author, EMPTY)
+        self.assertFalse(embed.footer)
+        self.assertNotIn("cooldowns", embed.footer.text)
+        self.assertIsInstance(embed.author.icon_url, str)
+        # attributes are only looked up once
+        self.assertIs(view.author, view.author)
+
+    def test_compares_as_wrapped_object(self):
+        message = live_message()
+        view = MessageView(message)
+        self.assertEqual(view.author, message.author)
+        self.assertEqual(view.author, MessageView(message).author)
+        self.assertFalse(view.author != message.author)
+        self.assertEqual(str(view.channel.id), "10")
+
+    def test_empty(self):
+        self.assertIs(EMPTY.anything.at.all, EMPTY)
+        self.assertEqual((bool(EMPTY), str(EMPTY), list(EMPTY), "a" in EMPTY), (False, "", [], False))
+        with self.assertRaises(Exception):
+            EMPTY()
+
+    @benchmark
+    def test_attribute_access_benchmark(self):
+        rounds, repeats, timings = 500, 5, {"Namespace": [], "MessageView": []}
+        for _ in range(repeats):
+            replayed = [message_data() for _ in range(rounds)]
+            live = [plain_message() for _ in range(rounds)]
+            start = time.perf_counter()
+            for data in replayed:
+                touch(Namespace.from_collection(data))
+            timings["Namespace"].append((time.perf_counter() - start) / rounds)
+            start = time.perf_counter()
+            for message in live:
+                touch(MessageView(message))
+            timings["MessageView"].append((time.perf_counter() - start) / rounds)
+        timings = {name: min(timing) for name, timing in timings.items()}
+        report("message", timings)
@@ -0,0 +1,52 @@
+import time
+
+from django.test import SimpleTestCase
+
+from epic.cmd import cmd
+from epic.tests.util import benchmark, report
+from epic.types.classes import RCDMessage, HelpMessage, NormalMessage
+
+
+class TestHelpMessage(SimpleTestCase):
+    docs = [command.__doc__ for command in cmd.register.registry if command.__doc__]
+
+    def test_matches_markup_pass(self):
+        extra_fields = [("Info", "Your current multiplier is `None`")]
+        for doc in self.docs:
+            for fields in (None, extra_fields):
+                # a plain RCDMessage still goes through markup_pass every time
+                expected, help_message = RCDMessage(doc, fields=fields), HelpMessage(doc, fields=fields)
+                self.assertEqual(
+                    (help_message.msg, help_message.title, help_message.fields),
+                    (expected.msg, expected.title, expected.fields),
+                )
+                self.assertEqual(help_message.to_embed().to_dict()["fields"], expected.to_embed().to_dict()["fields"])
+
+    def test_frozen_message(self):
+        message = NormalMessage.frozen("# Title\n## Section\nContent\n")
+        self.assertIs(message, NormalMessage.frozen("# Title\n## Section\nContent\n"))
+        embed = message.to_embed()
+        embed.add_field(name="Extra", value="Field")
+        self.assertEqual(len(message.to_embed().fields), 1)
+        self.assertEqual(message.to_embed().title, "Title")
+
+    def test_prerendered_matches_rendered(self):
+        class RenderedHelpMessage(HelpMessage):
+            # parses the markup on every instantiation like any other message
+            __init__ = RCDMessage.__init__
+
+        for doc in self.docs:
+            expected = RenderedHelpMessage(doc).to_embed().to_dict()
+            self.assertEqual(HelpMessage(doc).to_embed().to_dict(), expected)
+            self.assertEqual(HelpMessage.frozen(doc).to_embed().to_dict(), expected)
+
+    @benchmark
+    def test_help_benchmark(self):
+        rounds, timings = 20, {}
+        for message_class in (RCDMessage, HelpMessage):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for doc in self.docs:
+                    message_class(doc).to_embed()
+            timings[message_class.__name__] = (time.perf_counter() - start) / (rounds * len(self.docs))
+        report("help message", timings)
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from epic.handlers import prefilter
+from epic.types import Namespace
+
+
+def message(content, author_id=1, embeds=()):
+    return Namespace.from_collection({"content": content, "author": {"id": author_id}, "embeds": list(embeds)})
+
+
+class TestMessageFilter(SimpleTestCase):
+    def test_classify(self):
+        message_filter = prefilter.MessageFilter()
+        cases = [
+            ("rcd", prefilter.RCD),
+            ("RRD cd", prefilter.RCD),
+            ("  rpg hunt", prefilter.RPG),
+            ("Rpg ascended not so mini boss join", prefilter.RPG),
+            ("rpgsomething", None),
+            ("hey, rpg hunt", None),
+            ("", None),
+        ]
+        for content, kind in cases:
+            self.assertEqual(message_filter.classify(message(content)), kind, content)
+        self.assertEqual(message_filter.classify(message("", prefilter.EPIC_RPG_ID)), prefilter.EPIC_RPG)
+        self.assertEqual(message_filter.classify(message("rcd", 2), user=Namespace(id=2)), None)
+        self.assertEqual((message_filter.seen, message_filter.dropped), (9, 4))
+
+    def test_classify_edit(self):
+        message_filter = prefilter.MessageFilter()
+        self.assertEqual(message_filter.classify_edit(message("", prefilter.EPIC_RPG_ID)), None)
+        self.assertEqual(
+            message_filter.classify_edit(message("", prefilter.EPIC_RPG_ID, [{"title": "guild"}])), prefilter.EPIC_RPG
+        )
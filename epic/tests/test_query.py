@@ -0,0 +1,117 @@
+import datetime
+
+from asgiref.sync import async_to_sync
+from django.test import TransactionTestCase
+
+from epic.models import Server, Profile, CoolDown, Guild
+from epic.query import (
+    get_cooldown_messages,
+    _upsert_cooldowns,
+    _set_guild_membership,
+    _known_guilds,
+    _known_player_guild,
+)
+
+
+class TestCooldownMessages(TransactionTestCase):
+    def setUp(self):
+        self.now = datetime.datetime.now(tz=datetime.timezone.utc)
+        self.server = Server.objects.create(id=1, name="Test Server")
+
+    def profile(self, uid, **kwargs):
+        return Profile.objects.create(
+            uid=uid, server=self.server, channel=10, last_known_nickname=uid, **{"notify": True, **kwargs}
+        )
+
+    def cooldown(self, profile, cd_type, seconds=-1):
+        return CoolDown.objects.create(
+            profile=profile, type=cd_type, after=self.now + datetime.timedelta(seconds=seconds)
+        )
+
+    def test_only_enabled_due_cooldowns_are_sent(self):
+        hunter, quiet, banned = (
+            self.profile("1", hunt=False),
+            self.profile("2", notify=False),
+            self.profile("3", banned=True),
+        )
+        self.cooldown(hunter, "hunt"), self.cooldown(hunter, "daily"), self.cooldown(hunter, "work", seconds=60)
+        self.cooldown(quiet, "daily"), self.cooldown(banned, "daily")
+
+        messages = async_to_sync(get_cooldown_messages)()
+        self.assertEqual(messages, [(f"<@1> {CoolDown.COOLDOWN_TEXT_MAP['daily']} (**Daily**)", 10)])
+        # sent reminders are cleaned up, disabled ones are left alone
+        self.assertEqual(
+            set(CoolDown.objects.values_list("profile_id", "type")),
+            {("1", "hunt"), ("1", "work"), ("2", "daily"), ("3", "daily")},
+        )
+
+    def test_inactive_server_is_skipped(self):
+        self.cooldown(self.profile("1"), "daily")
+        Server.objects.filter(id=self.server.id).update(active=False)
+        self.assertEqual(async_to_sync(get_cooldown_messages)(), [])
+
+
+class TestUpsertCooldowns(TransactionTestCase):
+    def setUp(self):
+        self.now = datetime.datetime.now(tz=datetime.timezone.utc).replace(microsecond=0)
+        server = Server.objects.create(id=1, name="Test Server")
+        self.profile = Profile.objects.create(uid="1", server=server, channel=10, last_known_nickname="1")
+
+    def after(self, minutes):
+        return self.now + datetime.timedelta(minutes=minutes)
+
+    def test_upsert_inserts_and_updates(self):
+        CoolDown.objects.create(profile=self.profile, type="hunt", after=self.after(1))
+        hunt_id = CoolDown.objects.get(type="hunt").id
+        _upsert_cooldowns(
+            [
+                CoolDown(profile_id="1", type="hunt", after=self.after(2)),
+                CoolDown(profile_id="1", type="daily", after=self.after(3)),
+                # the last cooldown for a given type wins
+                CoolDown(profile_id="1", type="daily", after=self.after(4)),
+            ]
+        )
+        self.assertEqual(
+            dict(CoolDown.objects.values_list("type", "after")), {"hunt": self.after(2), "daily": self.after(4)}
+        )
+        self.assertEqual(CoolDown.objects.get(type="hunt").id, hunt_id)
+
+    def test_upsert_nothing(self):
+        _upsert_cooldowns([])
+        self.assertEqual(CoolDown.objects.count(), 0)
+
+
+class TestSetGuildMembership(TransactionTestCase):
+    def setUp(self):
+        _known_guilds.clear()
+        _known_player_guild.clear()
+        server = Server.objects.create(id=1, name="Test Server")
+        for uid in "1234":
+            Profile.objects.create(uid=uid, server=server, channel=10, last_known_nickname=uid)
+        Guild.objects.create(name="Existing")
+
+    def membership(self):
+        return dict(Profile.objects.values_list("uid", "player_guild_id"))
+
+    def test_bulk_membership(self):
+        # BEGIN, one insert and one update
+        with self.assertNumQueries(3):
+            _set_guild_membership({"Existing": [1, 2], "New": ["3"], "Empty": []})
+        self.assertEqual(self.membership(), {"1": "Existing", "2": "Existing", "3": "New", "4": None})
+        self.assertEqual(set(Guild.objects.values_list("name", flat=True)), {"Existing", "New", "Empty"})
+        self.assertIsNotNone(Guild.objects.get(name="New").created)
+
+    def test_unchanged_membership_is_skipped(self):
+        _set_guild_membership({"Existing": [1, 2]})
+        with self.assertNumQueries(0):
+            _set_guild_membership({"Existing": ["2", "1"]})
+        _set_guild_membership({"Existing": [1], "New": [2]})
+        self.assertEqual(self.membership(), {"1": "Existing", "2": "New", "3": None, "4": None})
+
+    def test_moving_back_is_written(self):
+        _set_guild_membership({"Existing": [1, 2]})
+        _set_guild_membership({"New": [1]})
+        # only player 1 moved back
+        with self.assertNumQueries(3):
+            _set_guild_membership({"Existing": [1, 2]})
+        self.assertEqual(self.membership(), {"1": "Existing", "2": "Existing", "3": None, "4": None})
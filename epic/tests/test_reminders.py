@@ -0,0 +1,90 @@
+import asyncio
+import datetime
+
+from django.test import SimpleTestCase
+
+from epic.reminders import ReminderScheduler, ReminderDelivery, batch_messages
+
+
+class TestReminderScheduler(SimpleTestCase):
+    @staticmethod
+    def from_now(seconds):
+        return datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(seconds=seconds)
+
+    def test_wakes_for_earliest_reminder(self):
+        scheduler = ReminderScheduler()
+        scheduler.schedule_cooldown("1", "hunt", self.from_now(60))
+        scheduler.schedule_cooldown("2", "hunt", self.from_now(0.05))
+        due = asyncio.run(asyncio.wait_for(scheduler.wait(), 1))
+        self.assertEqual(due, [("cooldown", "2", "hunt")])
+        self.assertEqual(len(scheduler), 1)
+
+    def test_reschedule_replaces_due_time(self):
+        scheduler = ReminderScheduler()
+        scheduler.schedule_cooldown("1", "hunt", self.from_now(0.05))
+        scheduler.schedule_cooldown("1", "hunt", self.from_now(60))
+        scheduler.schedule_guild("guild", self.from_now(0.1))
+        due = asyncio.run(asyncio.wait_for(scheduler.wait(), 1))
+        self.assertEqual(due, [("guild", "guild")])
+
+    def test_rescheduling_does_not_grow_the_heap(self):
+        scheduler = ReminderScheduler()
+        for seconds in range(1000):
+            scheduler.schedule_cooldown("1", "hunt", self.from_now(60 + seconds))
+            scheduler.schedule_cooldown("2", "hunt", self.from_now(120))
+        self.assertEqual(len(scheduler), 2)
+        self.assertLessEqual(len(scheduler._heap), 4)
+        # only the latest due time of every key is left
+        due = scheduler._pop_due(self.from_now(2000).timestamp())
+        self.assertEqual(sorted(due), [("cooldown", "1", "hunt"), ("cooldown", "2", "hunt")])
+
+    def test_schedule_wakes_sleeping_loop(self):
+        scheduler = ReminderScheduler()
+
+        async def scenario():
+            waiter = asyncio.ensure_future(scheduler.wait())
+            await asyncio.sleep(0.05)
+            scheduler.schedule_cooldown("1", "daily", self.from_now(0))
+            return await asyncio.wait_for(waiter, 1)
+
+        self.assertEqual(asyncio.run(scenario()), [("cooldown", "1", "daily")])
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content):
+        self.sent.append(content)
+
+
+class FakeDiscordClient:
+    def __init__(self, cached, remote):
+        self.cached, self.remote, self.fetches = cached, remote, 0
+
+    def get_channel(self, channel_id):
+        return self.cached.get(channel_id)
+
+    async def fetch_channel(self, channel_id):
+        self.fetches += 1
+        return self.remote[channel_id]
+
+
+class TestReminderDelivery(SimpleTestCase):
+    def test_batch_messages(self):
+        batches = batch_messages([("a" * 10, 1), ("b" * 10, 2), ("c" * 10, 1), ("d" * 10, 1)], limit=21)
+        self.assertEqual(batches, {1: [f"{'a' * 10}\n{'c' * 10}", "d" * 10], 2: ["b" * 10]})
+
+    def test_send_uses_cached_channels(self):
+        cached, remote = FakeChannel(), FakeChannel()
+        client = FakeDiscordClient({1: cached}, {2: remote})
+
+        async def scenario():
+            delivery = ReminderDelivery(client)
+            await delivery.send([("one", 1), ("two", 2), ("three", 1)])
+            await delivery.send([("four", 2)])
+
+        asyncio.run(scenario())
+        self.assertEqual(cached.sent, ["one\nthree"])
+        self.assertEqual(remote.sent, ["two", "four"])
+        self.assertEqual(client.fetches, 1)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from epic.models import Server, Profile, Sentinel
+from epic.types import Namespace
+from epic.types.classes import ErrorMessage, NormalMessage, SuccessMessage
+
+
+class TestInventorySentinels(TestCase):
+    def setUp(self):
+        server = Server.objects.create(id=1, name="Test Server")
+        self.profile = Profile.objects.create(uid="1", server=server, channel=2, last_known_nickname="JP")
+        self.embed = Namespace.from_collection(
+            {"fields": [{"name": "Items", "value": "**apple**: 5"}, {"name": "Consumables", "value": "**bread**: 1"}]}
+        )
+
+    def act(self):
+        return Sentinel.act(None, self.embed, self.profile, "inventory")
+
+    def test_nothing_pending(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.act(), ([], (None, ())))
+
+    def test_single_query_and_combined_message(self):
+        # without a recipe there is nothing to craft, so the extension is never needed
+        Sentinel.objects.create(trigger=0, profile=self.profile, action="how_many", metadata={"snoop": "2"})
+        Sentinel.objects.create(trigger=0, profile=self.profile, action="can_craft", metadata={"snoop": "2"})
+        Sentinel.objects.create(trigger=3, profile=self.profile)
+        with mock.patch("epic.inventory.parse_inventory", return_value={"apple": 5}) as parse_inventory:
+            with self.assertNumQueries(4):  # select, then the delete wrapped in a savepoint
+                messages, _ = self.act()
+        parse_inventory.assert_called_once_with("**apple**: 5", "**bread**: 1")
+        self.assertEqual(len(messages), 1)
+        self.assertIsInstance(messages[0], ErrorMessage)
+        self.assertEqual(messages[0].msg, "<@!1> Here's what I found in your inventory.")
+        self.assertEqual(len(messages[0].fields), 2)
+        self.assertEqual(list(Sentinel.objects.values_list("trigger", flat=True)), [3])
+
+    def test_already_answered(self):
+        Sentinel.objects.create(trigger=0, profile=self.profile, action="how_many", metadata={})
+
+        def parse_inventory(*fields):
+            # another inventory answers the sentinel while this one is being parsed
+            Sentinel.objects.all().delete()
+            return {"apple": 5}
+
+        with mock.patch("epic.inventory.parse_inventory", side_effect=parse_inventory):
+            self.assertEqual(self.act(), ([], (None, ())))
+
+    def test_craftable_out_of_time(self):
+        sentinel = Sentinel(trigger=0, profile=self.profile, action="craftable", metadata={"area": 10})
+        counts = {"fruit_salad": 2, "ruby_sword": 0, "edgy_sword": None, "edgy_armor": None}
+        with mock.patch("epic.inventory.craftable", return_value=(counts, True)):
+            (message,) = sentinel.craftable_message({"apple": 5}, self.profile)
+        self.assertIn("fruit salad: 2", message.msg)
+        self.assertNotIn("ruby sword", message.msg)
+        self.assertTrue(message.msg.endswith("_Ran out of time, 2 of 4 recipes weren't checked._"))
+
+    def test_combine(self):
+        combined = Sentinel.combine(
+            [
+                "<@!2> Psssstt... **JP** opened their inventory!\n",
+                NormalMessage("logs", title="Logs"),
+                "<@!2> Psssstt... **JP** opened their inventory!",
+                SuccessMessage("craft", title="Craft", fields=[("Full Recipe", "recipe")]),
+                NormalMessage("x" * 2000, title="Long"),
+            ],
+            "1",
+        )
+        self.assertEqual(len(combined), 3)
+        self.assertEqual(combined[0], "<@!2> Psssstt... **JP** opened their inventory!")
+        self.assertEqual(combined[1].msg, "<@!1> Here's what I found in your inventory.")
+        self.assertEqual(combined[1].fields, (("Logs", "logs"), ("Craft", "craft"), ("Full Recipe", "recipe")))
+        self.assertEqual(combined[2].title, "Long")
+        self.assertEqual(Sentinel.combine([NormalMessage("logs", title="Logs")], "1")[0].title, "Logs")
+
+    def assertFitsDiscord(self, message):
+        embed = message.to_embed()
+        self.assertLessEqual(len(embed.fields), 25)
+        self.assertLessEqual(len(embed), 6000)
+        for field in embed.fields:
+            self.assertLessEqual(len(field.name), 256)
+            self.assertLessEqual(len(field.value), 1024)
+
+    def test_combine_splits_long_fields(self):
+        recipe = "".join(f"{'item':>20}: {i}\n" for i in range(100))
+        combined = Sentinel.combine(
+            [
+                NormalMessage("logs", title="Logs"),
+                SuccessMessage("many", title="How Many", fields=[("Full Recipe", recipe)]),
+            ],
+            "1",
+        )
+        self.assertEqual(len(combined), 1)
+        self.assertFitsDiscord(combined[0])
+        names, values = zip(*combined[0].fields[2:])
+        self.assertEqual(names, ("Full Recipe", "\u200b", "\u200b"))
+        # split between lines
+        self.assertEqual("".join(values), recipe)
+        self.assertTrue(all(value.endswith("\n") for value in values))
+
+    def test_combine_respects_embed_limits(self):
+        many_fields = [NormalMessage(f"{i}", title=f"{i}") for i in range(30)]
+        combined = Sentinel.combine(many_fields, "1")
+        self.assertEqual([len(message.fields) for message in combined], [25, 5])
+        large = [NormalMessage("x" * 1000, title=f"{i}") for i in range(8)]
+        combined = Sentinel.combine(large, "1")
+        self.assertEqual([len(message.fields) for message in combined], [5, 3])
+        for message in combined:
+            self.assertFitsDiscord(message)
+        self.assertEqual(sum(len(message.fields) for message in combined), 8)
@@ -0,0 +1,49 @@
+import shlex
+
+from django.test import SimpleTestCase
+
+from epic.utils import tokenize
+
+
+def shlex_tokenize(cmd, preserve_case=False):
+    if not cmd:
+        return cmd
+    if not preserve_case:
+        cmd = cmd.lower()
+    try:
+        return shlex.split(cmd)
+    except ValueError:
+        return []
+
+
+class TestTokenize(SimpleTestCase):
+    corpus = [
+        "",
+        "rpg hunt",
+        "RPG Hunt T",
+        "  rcd   cd\t<@!1234>\n",
+        "rpg arena <@!1> <@!2>",
+        "rcd tz America/Chicago",
+        'rcd whocan "not so mini boss"',
+        "rpg trade e all",
+        "JP's inventory",
+        "rcd notify hunt on \\",
+        "rpg hunt",
+        "rpg hunt together",
+        'rcd gr "unclosed',
+    ]
+
+    def test_matches_shlex(self):
+        for cmd in self.corpus:
+            for preserve_case in (False, True):
+                self.assertEqual(tokenize(cmd, preserve_case), shlex_tokenize(cmd, preserve_case), cmd)
+
+    def test_returns_fresh_list(self):
+        tokens = tokenize("rpg hunt")
+        tokens.append("together")
+        self.assertEqual(tokenize("rpg hunt"), ["rpg", "hunt"])
+
+    def test_matches_shlex_uncached(self):
+        # distinct messages so the cache doesn't get to help
+        for cmd in [f"rpg arena <@!{i}> <@!{i + 1}>" for i in range(2000)]:
+            self.assertEqual(tokenize(cmd), shlex_tokenize(cmd))
@@ -1,7 +1,17 @@
+import os
+import sys
 import json
+import unittest
 
 from epic.types import Namespace
 
+# timings depend on the machine, so benchmarks only run when asked for and never assert on them
+benchmark = unittest.skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run the benchmarks")
+
+
+def report(unit: str, timings: dict):
+    sys.stderr.write(", ".join(f"{name}: {timing * 1e6:.1f}us per {unit}" for name, timing in timings.items()) + "\n")
+
 
 class FakeClient:
     user = "Test Client User"
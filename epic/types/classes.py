@@ -1,4 +1,6 @@
 import re
+import copy
+import functools
 from types import SimpleNamespace
 
 import discord
@@ -18,6 +20,8 @@ class RCDMessage:
     title = None
     footer = None
     fields = []
+    # prerendered embed, see frozen
+    _embed_data = None
 
     REGEXES = {
         "title": re.compile(r"\s*(?<!#)#\s*([^#\n]+)\n"),
@@ -29,21 +33,22 @@ class RCDMessage:
         "within_verbatim": re.compile(r"\s+([^\n]*)\n"),
     }
 
-    def markup_pass(self, msg, title, footer, fields):
+    @classmethod
+    def markup_pass(cls, msg, title, footer, fields):
         title, fields = title, list(fields)[::-1] if fields else []
         # go in reverse so the spans still point to valid indices as we iterate
-        for nobreak_match in list(self.REGEXES["nobreak"].finditer(msg))[::-1]:
+        for nobreak_match in list(cls.REGEXES["nobreak"].finditer(msg))[::-1]:
             # any text wrapped in "nobreak" indicators should have linebreaks removed
-            nobreak_content = " ".join(self.REGEXES["nobreak"].sub("\1", nobreak_match.groups()[0]).split())
+            nobreak_content = " ".join(cls.REGEXES["nobreak"].sub("\1", nobreak_match.groups()[0]).split())
             msg = replace_span(msg, nobreak_content, nobreak_match.span())
-        title_match = self.REGEXES["title"].search(msg)
+        title_match = cls.REGEXES["title"].search(msg)
         if title_match:
             title, msg = title_match.groups()[0], remove_span(msg, title_match.span())
-        for verbatim_match in list(self.REGEXES["verbatim"].finditer(msg))[::-1]:
+        for verbatim_match in list(cls.REGEXES["verbatim"].finditer(msg))[::-1]:
             language, content = verbatim_match.groups()
-            content = "\n".join(self.REGEXES["within_verbatim"].findall(f"{content}\n"))
+            content = "\n".join(cls.REGEXES["within_verbatim"].findall(f"{content}\n"))
             msg = replace_span(msg, f"```{language if language else ''}\n{content}\n```", verbatim_match.span())
-        for field_match in list(self.REGEXES["fields"].finditer(msg))[::-1]:
+        for field_match in list(cls.REGEXES["fields"].finditer(msg))[::-1]:
             section_name, section_content = field_match.groups()
             # adding this character https://unicode-table.com/en/200B/ prevents the first item from being
             # de-dented ¯\_(ツ)_/¯
@@ -62,8 +67,22 @@ class RCDMessage:
                 "fields": fields,
             },
         )
+        self.fields = tuple(self.fields) if self.fields else ()
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def frozen(cls, msg, title=None, footer=None):
+        """
+        Shared instance for message content which never changes, parsed and rendered only once.
+        """
+        message = cls(msg, title, footer)
+        message._embed_data = message.to_embed().to_dict()
+        return message
 
     def to_embed(self):
+        if self._embed_data:
+            # discord.Embed.from_dict keeps references to the data it is given
+            return discord.Embed.from_dict(copy.deepcopy(self._embed_data))
         kwargs = {"color": self.color, "description": self.msg}
         if self.title:
             kwargs["title"] = self.title
@@ -89,7 +108,15 @@ class HelpMessage(RCDMessage):
     color = 0xD703FC
 
     def __init__(self, msg, title=None, footer=None, fields=None):
-        super(HelpMessage, self).__init__(msg, title, footer, fields)
+        # help text comes from docstrings, so the markup is only parsed once
+        self.msg, self.title, markup_fields = self.parse(msg, title)
+        self.footer, self.fields = footer, (*markup_fields, *(fields or ()))
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def parse(cls, msg, title=None):
+        parsed = cls.markup_pass(msg, title, None, None)
+        return parsed["msg"], parsed["title"], tuple(parsed["fields"])
 
 
 class SuccessMessage(RCDMessage):
@@ -136,3 +163,83 @@ def _recursive_namespace(obj):
             obj[i] = _recursive_namespace(obj[i])
         return obj
     return obj
+
+
+class _Empty:
+    """
+    Falsy, allocation-free stand in for a missing attribute of a ``MessageView``;
+    every attribute of it is empty as well.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, item):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        raise Exception("Attempted call", args, kwargs)
+
+    def __bool__(self):
+        return False
+
+    def __str__(self):
+        return ""
+
+    def __iter__(self):
+        return iter(())
+
+    def __contains__(self, item):
+        return False
+
+    def __repr__(self):
+        return "EMPTY"
+
+
+EMPTY = _Empty()
+
+# returned as is from a MessageView
+_PLAIN_TYPES = {str, bytes, int, float, bool}
+
+
+def _view(value):
+    if type(value) in _PLAIN_TYPES:
+        return value
+    if value is None or value is discord.Embed.Empty:
+        return EMPTY
+    if isinstance(value, (list, tuple)):
+        return [_view(v) for v in value]
+    if callable(value):
+        return value
+    return MessageView(value)
+
+
+class MessageView:
+    """
+    Null-safe view of a live ``discord.Message`` (or any part of it). Missing, ``None`` and
+    ``Embed.Empty`` attributes come back as ``EMPTY``. Looked up attributes are stored on the view,
+    so only the first access of each one goes through ``__getattr__``.
+    """
+
+    __slots__ = ("_obj", "__dict__")
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getattr__(self, item):
+        value = self.__dict__[item] = _view(getattr(self._obj, item, None))
+        return value
+
+    def __eq__(self, other):
+        return self._obj == (other._obj if isinstance(other, MessageView) else other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __str__(self):
+        return str(self._obj)
+
+    def __bool__(self):
+        return bool(self._obj)
+
+    def __repr__(self):
+        return f"MessageView({self._obj!r})"
@@ -1,3 +1,4 @@
+import re
 import datetime
 import inspect
 import shlex
@@ -5,16 +6,27 @@ import functools
 import sys
 import traceback
 
+# characters which shlex.split treats differently than str.split: quotes, escapes and
+# whitespace other than the " \t\r\n" that shlex splits on
+_shlex_special = re.compile(r"[\'\"\\]|[^\S \t\r\n]")
+
+
+@functools.lru_cache(maxsize=1024)
+def _split(cmd):
+    if not _shlex_special.search(cmd):
+        return tuple(cmd.split())
+    try:
+        return tuple(shlex.split(cmd))
+    except ValueError:
+        return ()
+
 
 def tokenize(cmd, preserve_case=False):
     if not cmd:
         return cmd
     if not preserve_case:
         cmd = cmd.lower()
-    try:
-        return shlex.split(cmd)
-    except ValueError:
-        return []
+    return list(_split(cmd))
 
 
 def cast(value, _type, coercion=None):
@@ -1,21 +1,72 @@
-from typing import Tuple, List
+import functools
+from array import array
+from typing import Tuple, List, Dict, Sequence
 
 import materials
 from . import recipes
 from .models import Inventory, Items
 
+# players tend to reopen the same inventory over and over, so the (pure) results are kept around
+CACHE_SIZE = 1024
+
+
+# the inventories are cached (and handed to materials) as their raw bytes,
+# materials reads them through the buffer protocol without converting every item
+def _buffer(data: bytes) -> memoryview:
+    return memoryview(data).cast("Q")
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _can_craft(area: int, recipe: bytes, inventory: bytes) -> bool:
+    return materials.can_craft(_buffer(recipe), _buffer(inventory), area)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _how_many(area: int, recipe: bytes, inventory: bytes) -> Tuple[int, bytes]:
+    amount, total_recipe = materials.how_many(_buffer(recipe), _buffer(inventory), area)
+    return amount, array("Q", total_recipe).tobytes()
+
 
 def can_craft(recipe: Inventory, inventory: Inventory) -> bool:
-    return materials.can_craft(
-        recipe.inventory,
-        inventory.inventory,
-        inventory.area,
-    )
-
-
-def how_many(recipe: Inventory, inventory: Inventory) -> Tuple[int, List[int]]:
-    return materials.how_many(
-        recipe.inventory,
-        inventory.inventory,
-        inventory.area,
-    )
+    return _can_craft(inventory.area, recipe.inventory.tobytes(), inventory.inventory.tobytes())
+
+
+def how_many(recipe: Inventory, inventory: Inventory) -> Tuple[int, array]:
+    """
+    How many times the recipe can be crafted and the total recipe for that many. The total recipe is
+    an ``array('Q')`` in ``item_names`` order (like ``Inventory.inventory``), use ``list()`` for a list.
+    """
+    amount, total_recipe = _how_many(inventory.area, recipe.inventory.tobytes(), inventory.inventory.tobytes())
+    return amount, array("Q", _buffer(total_recipe))
+
+
+def _flatten(inventories: Sequence[Inventory]) -> memoryview:
+    return _buffer(b"".join(inventory.inventory.tobytes() for inventory in inventories))
+
+
+# the batch versions evaluate every recipe against the same inventory in a single call (without the GIL)
+def can_craft_batch(recipes: Sequence[Inventory], inventory: Inventory) -> List[bool]:
+    return materials.can_craft_batch(_flatten(recipes), inventory.inventory, inventory.area)
+
+
+def how_many_batch(recipes: Sequence[Inventory], inventory: Inventory) -> List[Tuple[int, array]]:
+    """
+    ``how_many`` for every recipe, total recipes are arrays as well.
+    """
+    return [
+        (amount, array("Q", total_recipe))
+        for amount, total_recipe in materials.how_many_batch(_flatten(recipes), inventory.inventory, inventory.area)
+    ]
+
+
+def future_batch(area: int, inventories: Sequence[Inventory]) -> List[int]:
+    return materials.future_batch(area, _flatten(inventories))
+
+
+def cache_info() -> Dict[str, "functools._CacheInfo"]:
+    return {"can_craft": _can_craft.cache_info(), "how_many": _how_many.cache_info()}
+
+
+def cache_clear():
+    _can_craft.cache_clear()
+    _how_many.cache_clear()
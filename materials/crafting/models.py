@@ -1,3 +1,5 @@
+import operator
+from array import array
 from typing import Union
 
 import materials
@@ -47,25 +49,40 @@ item_map = {name: idx for idx, name in enumerate(item_names)}
 Items = Enum(item_names)
 
 
+# unsigned 64 bit quantities, the same layout as the inventories on the rust side
+_empty = array("Q", bytes(8 * len(item_names)))
+
+
 class Inventory:
-    inventory = None
-    area = None
-    level = None
+    __slots__ = ("inventory", "area", "level")
 
     def __init__(self, area=10, level=1, **kwargs):
-        self.inventory = [0] * len(item_names)
+        self.inventory = array("Q", _empty)
         for item_name, qty in kwargs.items():
-            idx = item_map[getattr(Items, item_name)]
             assert isinstance(qty, int)
-            self.inventory[idx] = qty
+            self.inventory[self._get_idx(item_name)] = qty
         assert isinstance(area, int) and 1 <= area <= 15
         assert isinstance(level, int) and level > 0
         self.area = area
         self.level = level
 
+    @classmethod
+    def from_vector(cls, vector, area=10, level=1) -> "Inventory":
+        """
+        Inventory from any sequence (or buffer) of quantities in ``item_names`` order.
+        """
+        new = cls(area=area, level=level)
+        new.inventory = array("Q", vector)
+        assert len(new.inventory) == len(item_names)
+        return new
+
     @classmethod
     def _get_idx(cls, key: Union[int, str]):
-        return item_map[getattr(Items, key)] if isinstance(key, str) else key
+        if isinstance(key, str):
+            if key not in item_map:
+                raise AttributeError(key)
+            return item_map[key]
+        return key
 
     def __getitem__(self, item: Union[int, str]) -> int:
         return self.inventory[self._get_idx(item)]
@@ -74,17 +91,26 @@ class Inventory:
         self.inventory[self._get_idx(key)] = value
 
     def __add__(self, other: "Inventory"):
-        new = Inventory(area=self.area)
-        for idx in range(len(self.inventory)):
-            new[idx] = self.inventory[idx] + other.inventory[idx]
-        return new
+        return Inventory.from_vector(map(operator.add, self.inventory, other.inventory), area=self.area)
+
+    def __iadd__(self, other: "Inventory"):
+        inventory = self.inventory
+        for idx, qty in enumerate(other.inventory):
+            if qty:
+                inventory[idx] += qty
+        return self
 
     def __mul__(self, other: int):
         assert other >= 0, "Can only multiply by 0+"
-        new = Inventory(area=self.area)
-        for _ in range(other):
-            new = new + self
-        return new
+        return Inventory.from_vector([qty * other for qty in self.inventory], area=self.area)
+
+    def __imul__(self, other: int):
+        assert other >= 0, "Can only multiply by 0+"
+        inventory = self.inventory
+        for idx, qty in enumerate(inventory):
+            if qty:
+                inventory[idx] = qty * other
+        return self
 
     def future(self):
         return materials.future(self.area, *self.inventory[:12])
@@ -122,14 +122,10 @@ impl Strategy {
         let Strategy {mut inventory, actions} = self;
         return match (litem_cls, gitem_cls) {
             (Class::Log, _) => {
-                let mut gqty: u64 = 0;
-                let mut total_cost: u64 = 0;
                 let exchange_rate = TradeTable::rate_from_logs(inventory.area, &gitem_cls).denominator;
-                while lqty / exchange_rate > 0 && gqty < target_qty {
-                    gqty += 1;
-                    lqty -= exchange_rate;
-                    total_cost += exchange_rate;
-                };
+                // as many whole trades as the logs allow, up to the target
+                let gqty = min(lqty / exchange_rate, target_qty);
+                let total_cost = gqty * exchange_rate;
                 inventory[losing] -= total_cost;
                 inventory[gaining] += gqty;
                 Strategy{ inventory, actions }
@@ -286,21 +282,20 @@ impl Item {
         let Item(_, losing_name, _) = self;
         let start_idx = Items::index_of(&losing_name);
         let end_idx = Items::index_of(to);
-        // one at a time, dismantle from the starting item tier
-        // to the indicated item tier until either
-        // we run out of the starting tier or we have
-        // enough of the target tier
-        while available != 0 && current_qty < amount  {
-            let mut qty: u64 = 1;
-            let mut idx = start_idx;
-            let mut current_item = self.clone();
-            while idx > end_idx {
-                (current_item, qty) = current_item.dismantle(qty);
-                idx -= 1;
-            }
-            current_qty += qty;
-            available -= 1;
+        // what a single item of the starting tier dismantles into
+        let mut per_item: u64 = 1;
+        let mut idx = start_idx;
+        let mut current_item = self.clone();
+        while idx > end_idx {
+            (current_item, per_item) = current_item.dismantle(per_item);
+            idx -= 1;
         }
+        // dismantle from the starting item tier to the indicated item
+        // tier until either we run out of the starting tier or we have
+        // enough of the target tier
+        let dismantled = min(available, amount / per_item + (amount % per_item != 0) as u64);
+        current_qty = dismantled * per_item;
+        available -= dismantled;
         // (qty, remainder)
         (current_qty, available)
     }
@@ -365,17 +360,14 @@ impl Item {
         let Item(class, name, _) = self;
         let end_idx = Items::index_of(&name);
         let start_idx = Items::first_of(&class);
-        let mut logs_required = 0;
-        for _ in 0..amount {
-            let mut required_per_item = 1;
-            let mut idx = end_idx;
-            while idx > start_idx {
-                let Item(_, _, value_of_previous) = Items[idx];
-                required_per_item *= value_of_previous;
-                idx -= 1;
-            }
-            logs_required += required_per_item as u64;
+        let mut required_per_item = 1;
+        let mut idx = end_idx;
+        while idx > start_idx {
+            let Item(_, _, value_of_previous) = Items[idx];
+            required_per_item *= value_of_previous;
+            idx -= 1;
         }
+        let logs_required = amount * required_per_item as u64;
         if class == &Class::Log {
             return logs_required;
         }
@@ -759,11 +751,8 @@ impl Mul<usize> for Inventory {
 
     fn mul(self, rhs: usize) -> Self::Output {
         let mut inv = self.clone();
-        if rhs == 0 {
-            return Inventory::new(self.get_area());
-        }
-        for _ in 0..(rhs - 1) {
-            inv = inv + self.clone();
+        for idx in 0..Items::INV_SIZE {
+            inv[idx] *= rhs as u64;
         }
         inv
     }
@@ -46,7 +46,7 @@ fn test_future() {
     assert_eq!(res, 163840);
 }
 
-#[derive(Debug, PartialEq)]
+#[derive(Debug, Copy, Clone, Eq, PartialEq, Hash)]
 pub enum Branch {
     Trade,
     Upgrade,
@@ -131,12 +131,12 @@ fn exec_branch(recipe: Inventory, mut inv: Inventory, target: &Name, branch: &Br
             let mut working_inv = inv.clone();
             let (start, end) = (Items::index_of(&target), Items::first_of(&desired_class));
             let mut idx = start;
+            // if we already have enough of the target, we craft none of the lower tiers
+            should_craft[idx] -= min(working_inv[idx], should_craft[idx]);
             while idx > end {
-                let desired_amount = should_craft[idx];
-                let current_amount = working_inv[idx];
                 let num_lower_tier_for_ug = Items[idx - 1].required_for_upgrade(&Items[idx].1);
-                // if we already have enough of the higher tier, we craft none of the lower tier
-                let num_lower_tier_needed = num_lower_tier_for_ug * (desired_amount - min(current_amount, desired_amount));
+                // what is still to be crafted of this tier already accounts for what we have of it
+                let num_lower_tier_needed = num_lower_tier_for_ug * should_craft[idx];
                 // if we already have enough of the lower tier, we craft none, otherwise, we craft the difference
                 should_craft[idx - 1] = num_lower_tier_needed - min(working_inv[idx - 1], num_lower_tier_needed);
                 idx -= 1;
@@ -220,6 +220,53 @@ fn find_strategy(
     None
 }
 
+/// (remaining recipe, inventory, branch which led there) of a node in the search
+type SearchState = ([u64; Items::INV_SIZE], [u64; Items::INV_SIZE], Option<Branch>);
+
+/// Whether `find_strategy` would find any strategy at all.
+///
+/// The search is the same, but it stops at the first successful strategy instead
+/// of collecting all of them to pick the best one. The same inventories are reached
+/// again and again by taking the same branches in a different order, so states which
+/// already failed are remembered along with the depth they failed at; with less
+/// depth left to search they are bound to fail again.
+fn strategy_exists(
+    mut recipe: Inventory,
+    mut inventory: Inventory,
+    last_branch: Option<&Branch>,
+    depth: usize,
+    failed: &mut HashMap<SearchState, usize>,
+) -> bool {
+    if depth > 10 {
+        return false;
+    }
+    for (item, amount) in recipe.non_zero() {
+        let reduction = clamp(inventory[&item.1], 0, amount);
+        recipe[&item.1] -=  reduction;
+        inventory[&item.1] -= reduction;
+    }
+    if inventory >= recipe {
+        return true
+    }
+    let state = (recipe.inventory, inventory.inventory, last_branch.copied());
+    if let Some(&failed_depth) = failed.get(&state) {
+        if failed_depth <= depth { return false }
+    }
+    for (item, _) in recipe.non_zero() {
+        let Item(_, name, _) = item;
+        for branch in [Branch::Trade, Branch::Upgrade, Branch::Dismantle].iter() {
+            if last_branch == Some(branch) { continue }
+            for strategy in exec_branch(recipe, inventory, &name, branch).into_iter() {
+                if strategy_exists(recipe, strategy.inventory, Some(branch), depth + 1, failed) {
+                    return true
+                }
+            }
+        }
+    }
+    failed.insert(state, depth);
+    false
+}
+
 fn _can_craft(recipe: Inventory, inventory: Inventory) -> bool {
     // Modifying the inventory ahead of time is not an issue
     // as long as we don't affect the "craftability"
@@ -241,10 +288,7 @@ fn _can_craft(recipe: Inventory, inventory: Inventory) -> bool {
             }
         }
     }
-    if let Some(_) = find_strategy(recipe, inventory, None, 0) {
-       return true
-    }
-    return false;
+    strategy_exists(recipe, inventory, None, 0, &mut HashMap::new())
 }
 
 pub fn can_craft(
@@ -258,30 +302,86 @@ pub fn can_craft(
     )
 }
 
+/// What `qty` of the item at `idx` is worth in the base tier of its class.
+fn base_value(idx: usize, qty: u64) -> u128 {
+    let Item(class, ..) = Items[idx];
+    let mut value = qty as u128;
+    for tier in (Items::first_of(&class) + 1)..=idx {
+        value *= Items[tier].2 as u128;
+    }
+    value
+}
+
+/// What an inventory is worth in wooden logs (classes which can be traded in this area)
+/// and what it is worth per class (classes which can't).
+struct LogValue {
+    logs: u128,
+    by_class: HashMap<Class, u128>,
+}
+
+impl LogValue {
+    fn of(inventory: &Inventory) -> LogValue {
+        let area = inventory.get_area();
+        let mut value = LogValue { logs: 0, by_class: HashMap::new() };
+        for idx in 0..Items::INV_SIZE {
+            let Item(class, ..) = Items[idx];
+            if !Items[idx].is_craftable() || inventory[idx] == 0 {
+                continue
+            }
+            if class == Class::Log || area[&class] != 0 {
+                let rate = if class == Class::Log { 1 } else { area[&class] as u128 };
+                value.logs += base_value(idx, inventory[idx]) * rate;
+            } else {
+                *value.by_class.entry(class).or_insert(0) += base_value(idx, inventory[idx]);
+            }
+        }
+        value
+    }
+}
+
+/// How many times the recipe could be crafted if nothing were lost along the way.
+///
+/// Upgrades and trades keep the value of an inventory (dismantles only lose some of it),
+/// so nothing can be crafted more often than the inventory's worth in wooden logs
+/// divided by the recipe's. Classes which can't be traded in this area have to pay
+/// for their share of the recipe by themselves, as do the items which can't be crafted.
+fn how_many_upper_bound(recipe: Inventory, inventory: Inventory, inventory_value: &LogValue) -> u128 {
+    let recipe_value = LogValue::of(&recipe);
+    let mut bound = u128::MAX;
+    for idx in 0..Items::INV_SIZE {
+        if !Items[idx].is_craftable() && recipe[idx] != 0 {
+            bound = min(bound, inventory[idx] as u128 / recipe[idx] as u128);
+        }
+    }
+    if recipe_value.logs != 0 {
+        bound = min(bound, inventory_value.logs / recipe_value.logs);
+    }
+    for (class, class_needed) in recipe_value.by_class.iter() {
+        bound = min(bound, inventory_value.by_class.get(class).unwrap_or(&0) / class_needed);
+    }
+    bound
+}
+
 fn _how_many(
     recipe: Inventory,
     inventory: Inventory,
+    inventory_value: &LogValue,
 ) -> usize {
-    fn factor() -> usize { 5 };
-    fn find_upper_bound(
-        recipe: Inventory,
-        inventory: Inventory,
-        current: usize,
-    ) -> usize {
-        return if _can_craft(recipe, inventory) {
-            find_upper_bound(recipe * factor(), inventory, current * factor())
-        } else {
-            current
-        }
+    if recipe.len() == 0 {
+        return 0 // could be crafted forever
     }
-    fn midpoint(a: usize, b: usize) -> usize { (b - a) / 2 + a }
-    let mut b = find_upper_bound(recipe * factor(), inventory, factor());
-    let mut a = if b > factor() { b / factor() } else { 0 };
+    let bound = min(how_many_upper_bound(recipe, inventory, inventory_value), usize::MAX as u128) as usize;
+    if bound == 0 || _can_craft(recipe * bound, inventory) {
+        return bound
+    }
+    // some of the value is lost on the way to the recipe,
+    // binary search for the most that can actually be crafted
+    let (mut a, mut b) = (0, bound);
     while b - a > 1 {
-        let midpoint = midpoint(a, b);
+        let midpoint = (b - a) / 2 + a;
         if _can_craft(recipe * midpoint, inventory) { a = midpoint } else { b = midpoint }
     }
-    return if _can_craft(recipe * a, inventory) { a } else { b }
+    a
 }
 
 pub fn how_many(
@@ -290,13 +390,118 @@ pub fn how_many(
     area: usize,
 ) -> (usize, [u64; Items::INV_SIZE]) {
     let recipe = Inventory::from_array(TradeTable::from_usize(area).unwrap(), recipe);
-    let result = _how_many(
-        recipe,
-        Inventory::from_array(TradeTable::from_usize(area).unwrap(), inventory),
-    );
+    let inventory = Inventory::from_array(TradeTable::from_usize(area).unwrap(), inventory);
+    let result = _how_many(recipe, inventory, &LogValue::of(&inventory));
     return (result, (recipe * result).inventory)
 }
 
+/// Split a flat buffer of quantities into inventories of `Items::INV_SIZE` items each.
+pub fn split_inventories(buffer: &[u64]) -> Option<Vec<[u64; Items::INV_SIZE]>> {
+    if buffer.len() % Items::INV_SIZE != 0 {
+        return None
+    }
+    Some(buffer.chunks(Items::INV_SIZE).map(|chunk| {
+        let mut inventory = [0; Items::INV_SIZE];
+        inventory.copy_from_slice(chunk);
+        inventory
+    }).collect())
+}
+
+pub fn can_craft_batch(
+    recipes: &[[u64; Items::INV_SIZE]],
+    inventory: [u64; Items::INV_SIZE],
+    area: usize,
+) -> Vec<bool> {
+    recipes.iter().map(|recipe| can_craft(*recipe, inventory, area)).collect()
+}
+
+pub fn how_many_batch(
+    recipes: &[[u64; Items::INV_SIZE]],
+    inventory: [u64; Items::INV_SIZE],
+    area: usize,
+) -> Vec<(usize, [u64; Items::INV_SIZE])> {
+    let area = TradeTable::from_usize(area).unwrap();
+    let inventory = Inventory::from_array(area, inventory);
+    // the inventory is the same for every recipe, so it only needs to be valued once
+    let inventory_value = LogValue::of(&inventory);
+    recipes.iter().map(|recipe| {
+        let recipe = Inventory::from_array(area, *recipe);
+        let result = _how_many(recipe, inventory, &inventory_value);
+        (result, (recipe * result).inventory)
+    }).collect()
+}
+
+pub fn future_batch(area: usize, inventories: &[[u64; Items::INV_SIZE]]) -> Option<Vec<u64>> {
+    let area = TradeTable::from_usize(area)?;
+    Some(inventories.iter().map(|inventory| {
+        // only logs, fish, fruit and rubies count towards the future
+        let mut items = [0; Items::INV_SIZE];
+        items[..=Items::index_of(&Name::Ruby)].copy_from_slice(&inventory[..=Items::index_of(&Name::Ruby)]);
+        Inventory::from_array(area, items).log_value()
+    }).collect())
+}
+
+#[test]
+fn test_batches() {
+    let fruit_salad = Inventory::from_vec(TradeTable::A10, vec![(&Name::Apple, 25), (&Name::Banana, 6)]).inventory;
+    let ruby_sword = Inventory::from_vec(TradeTable::A10, vec![(&Name::Ruby, 4), (&Name::MegaLog, 1), (&Name::Potato, 36)]).inventory;
+    let inv = Inventory::from_vec(TradeTable::A10, vec![(&Name::Apple, 100_000), (&Name::Potato, 40)]).inventory;
+
+    let buffer: Vec<u64> = fruit_salad.iter().chain(ruby_sword.iter()).cloned().collect();
+    let recipes = split_inventories(&buffer).unwrap();
+    assert_eq!(recipes, vec![fruit_salad, ruby_sword]);
+    assert_eq!(split_inventories(&buffer[1..]), None);
+
+    assert_eq!(can_craft_batch(&recipes, inv, 10), vec![can_craft(fruit_salad, inv, 10), can_craft(ruby_sword, inv, 10)]);
+    assert_eq!(how_many_batch(&recipes, inv, 10), vec![how_many(fruit_salad, inv, 10), how_many(ruby_sword, inv, 10)]);
+    assert_eq!(
+        future_batch(2, &[inv, fruit_salad]).unwrap(),
+        vec![future_logs(2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 100_000, 0, 0).unwrap(), future_logs(2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 25, 6, 0).unwrap()]
+    );
+    assert_eq!(future_batch(16, &[inv]), None);
+}
+
+#[test]
+fn test_batches_match_single_calls() {
+    // a small linear congruential generator, so the cases are the same on every run
+    let mut seed: u64 = 0x2545_f491;
+    let mut random = move |bound: u64| {
+        seed = seed.wrapping_mul(6_364_136_223_846_793_005).wrapping_add(1_442_695_040_888_963_407);
+        (seed >> 33) % bound
+    };
+    for case in 0..30 {
+        // areas where every class in the recipes can be traded
+        let area = 5 + case % 11;
+        let (mut inventory, mut recipes) = ([0; Items::INV_SIZE], vec![[0; Items::INV_SIZE]; 4]);
+        for _ in 0..4 {
+            inventory[random(Items::INV_SIZE as u64) as usize] += random(300);
+        }
+        for recipe in recipes.iter_mut() {
+            for _ in 0..2 {
+                recipe[random(Items::index_of(&Name::Ruby) as u64) as usize] += 1 + random(20);
+            }
+        }
+        assert_eq!(
+            can_craft_batch(&recipes, inventory, area),
+            recipes.iter().map(|recipe| can_craft(*recipe, inventory, area)).collect::<Vec<_>>()
+        );
+        assert_eq!(
+            how_many_batch(&recipes, inventory, area),
+            recipes.iter().map(|recipe| how_many(*recipe, inventory, area)).collect::<Vec<_>>()
+        );
+        let expected: Vec<u64> = recipes.iter().chain(std::iter::once(&inventory)).map(|items| future_logs(
+            area,
+            items[0], items[1], items[2], items[3], items[4], items[5],
+            items[6], items[7], items[8],
+            items[9], items[10],
+            items[11],
+        ).unwrap()).collect();
+        let mut inventories = recipes.clone();
+        inventories.push(inventory);
+        assert_eq!(future_batch(area, &inventories).unwrap(), expected);
+    }
+}
+
 #[test]
 fn test_find_strategy_terminates() {
     find_strategy(Inventory::new(TradeTable::A1), Inventory::new(TradeTable::A1), None, 0);
@@ -431,6 +636,48 @@ fn test_can_craft_only() {
     dbg!(find_strategy(recipe, inv, None, 0).unwrap().1.inventory.log_value());
 }
 
+#[test]
+fn test_strategy_exists_agrees_with_find_strategy() {
+    let cases = vec![
+        (TradeTable::A1, vec![(&Name::NormieFish, 10)], vec![(&Name::WoodenLog, 10)]),
+        (TradeTable::A10, vec![(&Name::NormieFish, 10)], vec![(&Name::WoodenLog, 10)]),
+        (TradeTable::A6, vec![(&Name::NormieFish, 24)], vec![(&Name::EpicFish, 2)]),
+        (TradeTable::A6, vec![(&Name::WoodenLog, 163_841)], vec![(&Name::UltraLog, 2)]),
+        (TradeTable::A1, vec![(&Name::NormieFish, 960), (&Name::WoodenLog, 1)], vec![(&Name::EpicFish, 1)]),
+        (TradeTable::A1, vec![(&Name::MegaLog, 1)], vec![(&Name::WoodenLog, 2500)]),
+        (TradeTable::A10, vec![(&Name::Ruby, 5), (&Name::MegaLog, 1), (&Name::WoodenLog, 400)], vec![(&Name::Ruby, 10), (&Name::WoodenLog, 400)]),
+    ];
+    for (area, recipe, inv) in cases.into_iter() {
+        let (recipe, inv) = (Inventory::from_vec(area, recipe), Inventory::from_vec(area, inv));
+        assert_eq!(
+            find_strategy(recipe, inv, None, 0).is_some(),
+            strategy_exists(recipe, inv, None, 0, &mut HashMap::new())
+        );
+    }
+}
+
+#[test]
+fn test_can_craft_large_inventory() {
+    // fruit ice cream from a pile of ultra logs, this used to take minutes
+    let recipe = Inventory::from_vec(TradeTable::A11, vec![(&Name::SuperLog, 1), (&Name::Apple, 2), (&Name::Banana, 1)]);
+    let inv = Inventory::from_vec(TradeTable::A11, vec![
+        (&Name::UltraLog, 2000), (&Name::EpicFish, 10), (&Name::CommonLootbox, 20_000), (&Name::EpicLootbox, 20_000),
+    ]);
+    assert!(_can_craft(recipe, inv));
+    assert!(!_can_craft(Inventory::from_vec(TradeTable::A11, vec![(&Name::UltraLog, 2001)]), inv));
+}
+
+#[test]
+fn test_upgrade_counts_higher_tiers_once() {
+    // the super logs on hand used to be subtracted twice on the way down to wooden logs,
+    // so too few were upgraded and the ultra log was never reached
+    let recipe = Inventory::from_vec(TradeTable::A10, vec![(&Name::WoodenLog, 1000), (&Name::UltraLog, 1)]);
+    let inv = Inventory::from_vec(TradeTable::A10, vec![(&Name::Apple, 171_799), (&Name::SuperLog, 15)]);
+    assert!(_can_craft(recipe, inv));
+    let inv = Inventory::from_vec(TradeTable::A10, vec![(&Name::WoodenLog, 250_000), (&Name::MegaLog, 1)]);
+    assert!(_can_craft(Inventory::from_vec(TradeTable::A10, vec![(&Name::UltraLog, 1)]), inv));
+}
+
 #[test]
 fn test_how_many() {
     // apple=25, banana=6
@@ -438,5 +685,28 @@ fn test_how_many() {
         TradeTable::A10, vec![(&Name::Apple, 25), (&Name::Banana, 6)]
     );
     let inv = Inventory::from_vec(TradeTable::A10, vec![(&Name::Apple, 100_000)]);
-    assert_eq!(_how_many(recipe, inv), 869)
+    assert_eq!(_how_many(recipe, inv, &LogValue::of(&inv)), 869);
+
+    assert_eq!(_how_many(Inventory::new(TradeTable::A10), inv, &LogValue::of(&inv)), 0);
+}
+
+#[test]
+fn test_how_many_is_craftable() {
+    let cases = vec![
+        (TradeTable::A10, vec![(&Name::Apple, 25), (&Name::Banana, 6)], vec![(&Name::Apple, 2_000)]),
+        (TradeTable::A10, vec![(&Name::Apple, 25), (&Name::Banana, 6)], vec![(&Name::WoodenLog, 9_000)]),
+        (TradeTable::A6, vec![(&Name::NormieFish, 24)], vec![(&Name::EpicFish, 2), (&Name::GoldenFish, 3)]),
+        (TradeTable::A1, vec![(&Name::EpicLog, 1), (&Name::WoodenLog, 15)], vec![(&Name::SuperLog, 3)]),
+        (TradeTable::A3, vec![(&Name::Bread, 1), (&Name::Carrot, 160)], vec![(&Name::Bread, 5), (&Name::Carrot, 500)]),
+        (TradeTable::A10, vec![(&Name::Ruby, 4), (&Name::MegaLog, 1), (&Name::Potato, 36)], vec![(&Name::Ruby, 30), (&Name::HyperLog, 1), (&Name::Potato, 200)]),
+    ];
+    for (area, recipe, inv) in cases.into_iter() {
+        let (recipe, inv) = (Inventory::from_vec(area, recipe), Inventory::from_vec(area, inv));
+        let inv_value = LogValue::of(&inv);
+        let count = _how_many(recipe, inv, &inv_value);
+        assert!(count as u128 <= how_many_upper_bound(recipe, inv, &inv_value), "{}", recipe);
+        // can_craft is not monotonic (3 super logs make 13 wooden swords but not 10),
+        // so only the next count is guaranteed to fail
+        assert!(_can_craft(recipe * count, inv) && !_can_craft(recipe * (count + 1), inv), "{}", recipe);
+    }
 }
@@ -6,9 +6,40 @@ mod tests;
 mod external;
 mod utils;
 
+use std::mem;
+
 use pyo3::prelude::*;
+use pyo3::buffer::{Element, PyBuffer};
 use pyo3::{wrap_pyfunction, exceptions};
 
+/// The buffer exported by `obj`, if it holds unsigned 64 bit integers (`array('Q')`, `numpy.uint64`).
+fn u64_buffer(py: Python, obj: &PyAny) -> Option<PyBuffer> {
+    let buffer = PyBuffer::get(py, obj).ok()?;
+    if buffer.item_size() == mem::size_of::<u64>() && u64::is_compatible_format(buffer.format()) {
+        return Some(buffer)
+    }
+    None
+}
+
+/// Quantities from a buffer of unsigned 64 bit integers, which is read as is, or from any other sequence of integers.
+fn quantities(py: Python, obj: &PyAny) -> Result<Vec<u64>, PyErr> {
+    match u64_buffer(py, obj) {
+        Some(buffer) => buffer.to_vec::<u64>(py),
+        None => obj.extract(),
+    }
+}
+
+fn inventory(py: Python, obj: &PyAny) -> Result<[u64; crafting::Items::INV_SIZE], PyErr> {
+    match u64_buffer(py, obj) {
+        Some(buffer) => {
+            let mut inventory = [0; crafting::Items::INV_SIZE];
+            buffer.copy_to_slice::<u64>(py, &mut inventory)?;
+            Ok(inventory)
+        }
+        None => obj.extract(),
+    }
+}
+
 #[pyfunction]
 pub fn future(
     area: usize,
@@ -30,21 +61,71 @@ pub fn future(
 }
 
 #[pyfunction]
-pub fn can_craft(
-    recipe: [u64; crafting::Items::INV_SIZE],
-    inventory: [u64; crafting::Items::INV_SIZE],
-    area: usize,
-) -> bool {
-   external::can_craft(recipe, inventory, area)
+pub fn can_craft(py: Python, recipe: &PyAny, inventory: &PyAny, area: usize) -> Result<bool, PyErr> {
+    let (recipe, inventory) = (self::inventory(py, recipe)?, self::inventory(py, inventory)?);
+    Ok(external::can_craft(recipe, inventory, area))
 }
 
 #[pyfunction]
 pub fn how_many(
-    recipe: [u64; crafting::Items::INV_SIZE],
-    inventory: [u64; crafting::Items::INV_SIZE],
+    py: Python,
+    recipe: &PyAny,
+    inventory: &PyAny,
+    area: usize,
+) -> Result<(usize, [u64; crafting::Items::INV_SIZE]), PyErr> {
+    let (recipe, inventory) = (self::inventory(py, recipe)?, self::inventory(py, inventory)?);
+    Ok(external::how_many(recipe, inventory, area))
+}
+
+fn check_area(area: usize) -> Result<(), PyErr> {
+    match crafting::TradeTable::from_usize(area) {
+        Some(_) => Ok(()),
+        None => Err(exceptions::PyValueError::new_err(format!("A{} is not a valid area!", area))),
+    }
+}
+
+fn split_inventories(py: Python, obj: &PyAny) -> Result<Vec<[u64; crafting::Items::INV_SIZE]>, PyErr> {
+    let buffer = quantities(py, obj)?;
+    match external::split_inventories(&buffer) {
+        Some(inventories) => Ok(inventories),
+        None => Err(exceptions::PyValueError::new_err(format!(
+            "Expected a multiple of {} quantities, got {}!", crafting::Items::INV_SIZE, buffer.len()
+        ))),
+    }
+}
+
+/// `recipes` is a flat buffer of `INVENTORY_SIZE` quantities per recipe
+#[pyfunction]
+pub fn can_craft_batch(
+    py: Python,
+    recipes: &PyAny,
+    inventory: &PyAny,
     area: usize,
-) -> (usize, [u64; crafting::Items::INV_SIZE]) {
-    external::how_many(recipe, inventory, area)
+) -> Result<Vec<bool>, PyErr> {
+    check_area(area)?;
+    let (recipes, inventory) = (split_inventories(py, recipes)?, self::inventory(py, inventory)?);
+    Ok(py.allow_threads(move || external::can_craft_batch(&recipes, inventory, area)))
+}
+
+/// `recipes` is a flat buffer of `INVENTORY_SIZE` quantities per recipe
+#[pyfunction]
+pub fn how_many_batch(
+    py: Python,
+    recipes: &PyAny,
+    inventory: &PyAny,
+    area: usize,
+) -> Result<Vec<(usize, [u64; crafting::Items::INV_SIZE])>, PyErr> {
+    check_area(area)?;
+    let (recipes, inventory) = (split_inventories(py, recipes)?, self::inventory(py, inventory)?);
+    Ok(py.allow_threads(move || external::how_many_batch(&recipes, inventory, area)))
+}
+
+/// `inventories` is a flat buffer of `INVENTORY_SIZE` quantities per inventory
+#[pyfunction]
+pub fn future_batch(py: Python, area: usize, inventories: &PyAny) -> Result<Vec<u64>, PyErr> {
+    check_area(area)?;
+    let inventories = split_inventories(py, inventories)?;
+    Ok(py.allow_threads(move || external::future_batch(area, &inventories).unwrap()))
 }
 
 #[pymodule]
@@ -52,6 +133,9 @@ fn materials(py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(future, m)?).unwrap();
     m.add_function(wrap_pyfunction!(can_craft, m)?).unwrap();
     m.add_function(wrap_pyfunction!(how_many, m)?).unwrap();
+    m.add_function(wrap_pyfunction!(can_craft_batch, m)?).unwrap();
+    m.add_function(wrap_pyfunction!(how_many_batch, m)?).unwrap();
+    m.add_function(wrap_pyfunction!(future_batch, m)?).unwrap();
     m.add("INVENTORY_SIZE", crafting::Items::INV_SIZE);
     Ok(())
 }
@@ -1,8 +1,19 @@
+import os
+import sys
 import time
-from unittest import TestCase
+from array import array
+from unittest import TestCase, skipUnless
 
 import crafting
-from crafting.recipes import RUBY_SWORD, EDGY_ARMOR, EDGY_SWORD, FRUIT_SALAD
+import materials
+from crafting.recipes import RUBY_SWORD, EDGY_ARMOR, EDGY_SWORD, FRUIT_SALAD, FRUIT_ICE_CREAM
+
+# timings depend on the machine, so benchmarks only run when asked for and never assert on them
+benchmark = skipUnless(os.environ.get("BENCHMARK"), "set BENCHMARK=1 to run the benchmarks")
+
+
+def report(timings: dict):
+    sys.stderr.write(", ".join(f"{name}: {timing * 1000:.1f}ms" for name, timing in timings.items()) + "\n")
 
 
 class TestFuture(TestCase):
@@ -75,7 +86,20 @@ class TestCanCraft(TestCase):
 
     def test_real(self):
         self.assertTrue(crafting.can_craft(RUBY_SWORD, self.real_inv))
-        # self.assertTrue(crafting.can_craft(EDGY_SWORD, self.real_inv))
+        self.assertTrue(crafting.can_craft(EDGY_SWORD, self.real_inv))
+
+    large_inv = crafting.Inventory(11, ultra_log=2000, epic_fish=10, common=20_000, epic=20_000)
+
+    def test_large_inventory(self):
+        self.assertTrue(crafting.can_craft(FRUIT_ICE_CREAM, self.large_inv))
+        self.assertFalse(crafting.can_craft(FRUIT_ICE_CREAM * 10**9, self.large_inv))
+
+    @benchmark
+    def test_large_inventory_benchmark(self):
+        crafting.cache_clear()
+        start = time.perf_counter()
+        crafting.can_craft(FRUIT_ICE_CREAM, self.large_inv)
+        report({"can_craft": time.perf_counter() - start})
 
 
 class TestHowMany(TestCase):
@@ -116,3 +140,98 @@ class TestHowMany(TestCase):
         start = time.time()
         how_many, total_recipe = crafting.how_many(wooden_log_recipe, self.slow_inv)
         self.assertTrue(time.time() - start <= expected)
+
+
+class TestInventory(TestCase):
+    def test_arithmetic(self):
+        recipe = crafting.Inventory(apple=25, banana=6)
+        self.assertEqual((recipe * 3).inventory, (recipe + recipe + recipe).inventory)
+        self.assertEqual((recipe * 0).inventory, crafting.Inventory().inventory)
+        inventory = crafting.Inventory(apple=1)
+        inventory += recipe
+        inventory *= 2
+        self.assertEqual(inventory.to_dict(), crafting.Inventory(apple=52, banana=12).to_dict())
+        self.assertEqual(crafting.Inventory.from_vector(inventory.inventory).inventory, inventory.inventory)
+        with self.assertRaises(AttributeError):
+            crafting.Inventory(not_an_item=1)
+
+    def test_large_multiple(self):
+        # a single pass, repeated addition would not finish
+        recipe = crafting.Inventory(apple=25, banana=6) * 10**9
+        self.assertEqual((recipe["apple"], recipe["banana"]), (25 * 10**9, 6 * 10**9))
+
+
+class TestBatch(TestCase):
+    recipes = [RUBY_SWORD, EDGY_ARMOR, FRUIT_SALAD, FRUIT_ICE_CREAM]
+    inventory = crafting.Inventory(10, apple=171799, banana=54, potato=36, ruby=12, wooden_log=5000)
+
+    def test_batch_matches_scalar(self):
+        self.assertEqual(
+            crafting.can_craft_batch(self.recipes, self.inventory),
+            [crafting.can_craft(recipe, self.inventory) for recipe in self.recipes],
+        )
+        self.assertEqual(
+            crafting.how_many_batch(self.recipes, self.inventory),
+            [crafting.how_many(recipe, self.inventory) for recipe in self.recipes],
+        )
+        inventories = [self.inventory, crafting.Inventory(2, wooden_log=100_000)]
+        self.assertEqual(crafting.future_batch(2, inventories), [inv.future() for inv in inventories])
+
+    catalog = [recipe for recipe in crafting.recipes.full_map.values() if isinstance(recipe, crafting.Inventory)]
+    large_inv = crafting.Inventory(
+        10, apple=171799, banana=54, potato=360, ruby=120, wooden_log=50_000, ultra_log=20, dragon_scale=40
+    )
+
+    def test_full_catalog(self):
+        crafting.cache_clear()
+        self.assertEqual(
+            crafting.how_many_batch(self.catalog, self.large_inv),
+            [crafting.how_many(recipe, self.large_inv) for recipe in self.catalog],
+        )
+
+    @benchmark
+    def test_full_catalog_benchmark(self):
+        crafting.cache_clear()
+        start = time.perf_counter()
+        for recipe in self.catalog:
+            crafting.how_many(recipe, self.large_inv)
+        one_by_one = time.perf_counter() - start
+        start = time.perf_counter()
+        crafting.how_many_batch(self.catalog, self.large_inv)
+        report({"one by one": one_by_one, "batched": time.perf_counter() - start})
+
+    def test_bad_batch_raises(self):
+        with self.assertRaises(ValueError):
+            materials.can_craft_batch([1, 2, 3], self.inventory.inventory, 10)
+        with self.assertRaises(ValueError):
+            materials.future_batch(16, self.inventory.inventory)
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        crafting.cache_clear()
+
+    def test_repeated_inventory_is_cached(self):
+        inventory = crafting.Inventory(wooden_log=400, super_log=1000, potato=37)
+        self.assertTrue(crafting.can_craft(RUBY_SWORD, inventory))
+        self.assertTrue(crafting.can_craft(RUBY_SWORD, crafting.Inventory(wooden_log=400, super_log=1000, potato=37)))
+        self.assertEqual(crafting.cache_info()["can_craft"].hits, 1)
+        # a different area is a different question
+        self.assertTrue(
+            crafting.can_craft(RUBY_SWORD, crafting.Inventory(9, wooden_log=400, super_log=1000, potato=37))
+        )
+        self.assertEqual(crafting.cache_info()["can_craft"].misses, 2)
+
+    def test_how_many_returns_an_array(self):
+        inv = crafting.Inventory(area=10, apple=100_000)
+        how_many, total_recipe = crafting.how_many(FRUIT_SALAD, inv)
+        self.assertIsInstance(total_recipe, array)
+        self.assertEqual(list(total_recipe), list((FRUIT_SALAD * how_many).inventory))
+        self.assertIsInstance(crafting.how_many_batch([FRUIT_SALAD], inv)[0][1], array)
+
+    def test_cached_how_many_returns_copies(self):
+        inv = crafting.Inventory(area=10, apple=100_000)
+        how_many, total_recipe = crafting.how_many(FRUIT_SALAD, inv)
+        total_recipe[0] += 1
+        self.assertEqual(crafting.how_many(FRUIT_SALAD, inv), (how_many, (FRUIT_SALAD * how_many).inventory))
+        self.assertEqual(crafting.cache_info()["how_many"].hits, 1)
@@ -9,32 +9,63 @@ from asgiref.sync import sync_to_async
 # imported for side effects which setup django apps
 from epic_reminder import wsgi  # noqa
 
+from epic.members import MemberIndex
 from epic.models import GroupActivity
 from epic.query import (
     get_cooldown_messages,
     get_guild_cooldown_messages,
+    load_reminders,
 )
-from epic.handlers import rcd, rpg
+from epic.reminders import scheduler, ReminderDelivery
+from epic.handlers import rcd, rpg, prefilter
 
 logger = logging.getLogger(__name__)
 
 
 class Client(discord.Client):
+    message_filter = prefilter.MessageFilter()
+    member_index = MemberIndex()
+
     async def on_ready(self):
+        # on_ready also fires after reconnecting, when the member cache may have changed
+        self.member_index.rebuild(self.get_all_members())
         print("Logged on as {0}!".format(self.user))
 
-    async def on_message(self, message):
-        handler = rcd.RCDHandler(self, message)
-        await handler.perform_coroutine(handler.handle)
-        server, content = await handler.aget_server(), handler.content
+    async def on_guild_join(self, guild):
+        self.member_index.add_all(guild.members)
 
-        handler = rpg.CoolDownHandler(self, message, server)
-        await sync_to_async(handler.handle)()
+    async def on_guild_remove(self, guild):
+        self.member_index.remove_all(guild.members)
+
+    async def on_member_join(self, member):
+        self.member_index.add(member)
+
+    async def on_member_remove(self, member):
+        self.member_index.remove(member)
 
-        handler = await sync_to_async(rpg.RPGHandler)(self, message, server)
-        await handler.perform_coroutine(handler.handle)
+    async def on_member_update(self, before, after):
+        self.member_index.rename(before, after)
+
+    async def on_user_update(self, before, after):
+        self.member_index.rename(before, after)
+
+    async def on_message(self, message):
+        kind = self.message_filter.classify(message, self.user)
+        if kind == prefilter.RCD:
+            handler = rcd.RCDHandler(self, message)
+            await handler.aget_server()
+            await handler.perform_coroutine(handler.handle)
+        elif kind == prefilter.RPG:
+            handler = rpg.CoolDownHandler(self, message)
+            await handler.aget_server()
+            await sync_to_async(handler.handle)()
+        elif kind == prefilter.EPIC_RPG:
+            handler = await sync_to_async(rpg.RPGHandler)(self, message)
+            await handler.perform_coroutine(handler.handle)
 
     async def on_message_edit(self, before, after):
+        if self.message_filter.classify_edit(after) != prefilter.EPIC_RPG:
+            return
         handler = await sync_to_async(rpg.GuildListHandler)(self, after)
         await sync_to_async(handler.handle)()
 
@@ -49,27 +80,41 @@ def main():
 
     async def _notify():
         await bot.wait_until_ready()
+        await load_reminders()
+        delivery = ReminderDelivery(bot)
         while not bot.is_closed():
             try:
-                await sync_to_async(GroupActivity.objects.delete_stale)()
+                # sleeps until the next cooldown is due
+                await scheduler.wait()
                 cooldown_messages = [
                     *await get_cooldown_messages(),
                     *await get_guild_cooldown_messages(),
                 ]
-                for message, channel in cooldown_messages:
-                    _channel = await bot.fetch_channel(channel)
-                    await _channel.send(message)
-                # coode in here
+                await delivery.send(cooldown_messages)
             except (Exception, BaseException):
                 logger.exception("could not send reminder message")
-            finally:
-                await asyncio.sleep(5)  # task runs every 5 seconds
+                scheduler.retry_in(5)
 
     async def notify():
         while 1:
             await _notify()
 
+    async def _cleanup():
+        await bot.wait_until_ready()
+        while not bot.is_closed():
+            try:
+                await sync_to_async(GroupActivity.objects.delete_stale)()
+            except (Exception, BaseException):
+                logger.exception("could not clean up group activities")
+            finally:
+                await asyncio.sleep(30)
+
+    async def cleanup():
+        while 1:
+            await _cleanup()
+
     bot.loop.create_task(notify())
+    bot.loop.create_task(cleanup())
     bot.run(settings.DISCORD_TOKEN)
 
 